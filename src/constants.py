@@ -10,6 +10,9 @@ static mappings used throughout the application. Keeping constants in
 one place makes the codebase easier to configure and maintain.
 """
 
+import os
+import sys
+
 # Encoding
 
 ENCODING = "utf-8"
@@ -28,20 +31,71 @@ DNS_SERVERS = [("8.8.8.8", 53), ("1.1.1.1", 53)]  # Used to detect local IP via
 
 # Streaming Configuration
 
+def _chunk_size_from_env(default: int = 1024 * 1024, minimum: int = 64 * 1024) -> int:
+    """
+    Read the streaming chunk size from the VORTEX_CHUNK_SIZE variable.
+
+    The value is a plain integer number of bytes. Anything else is ignored
+    with a warning, so a typo can't stop Vortex from starting.
+
+    Args:
+        default: Chunk size used when the variable is unset or invalid.
+        minimum: Smallest chunk size accepted.
+
+    Returns:
+        The chunk size in bytes, at least ``minimum``.
+    """
+    value = os.environ.get("VORTEX_CHUNK_SIZE")
+    if value is None:
+        return default
+    try:
+        return max(minimum, int(value))
+    except ValueError:
+        print(
+            f"Warning: ignoring VORTEX_CHUNK_SIZE={value!r} "
+            f"(expected a number of bytes); using {default}",
+            file=sys.stderr,
+        )
+        return default
+
+
 # Chunk size for streaming file reads/writes.
 # 1MB optimized for modern networks to reduce I/O syscall overhead.
-CHUNK_SIZE = 1024 * 1024
+# Override with the VORTEX_CHUNK_SIZE environment variable (bytes, min 64KB).
+CHUNK_SIZE = _chunk_size_from_env()
 
 # Maximum size for multipart form headers before rejecting request.
 # Prevents memory exhaustion from malformed or malicious requests.
 MAX_HEADER_SIZE = 8 * 1024
 
+# Most unread request body that is read and discarded to keep a connection
+# alive. Past this the connection is closed instead, so a client can't hold
+# a worker by declaring a huge Content-Length and trickling bytes in.
+MAX_DRAIN_SIZE = 4 * 1024 * 1024
+
+# ZIP Downloads
+
+# Deflate level for compressible files in directory downloads (1 = fastest).
+# Higher levels shrink text a little more but cost several times the CPU.
+ZIP_COMPRESS_LEVEL = 1
+
+# HTTP Caching
+
+# ETags are derived from file size and mtime. Set to True to use an MD5 of
+# path, size and mtime instead (only matters on filesystems with coarse
+# mtimes where a file can change without its size or mtime changing).
+STRICT_ETAGS = False
+
 # Thread Pool Configuration
 
 # Maximum concurrent connections the server will handle.
 # Prevents resource exhaustion under high load.
 MAX_WORKERS = 100
 
+# Seconds a keep-alive connection may sit idle (or stall mid-transfer)
+# before it is closed, releasing its worker thread back to the pool.
+KEEPALIVE_TIMEOUT = 30
+
 # MIME Type Mapping
 # Comprehensive mapping of file extensions to MIME types.
 # Organized by category for maintainability.
@@ -151,3 +205,31 @@ MIME_TYPES = {
     ".iso": "application/x-iso9660-image",
     ".torrent": "application/x-bittorrent",
 }
+
+# Compression Hints
+# Used to skip deflate for ZIP entries that are already compressed.
+
+# Archive and container formats whose payload is already compressed
+PRECOMPRESSED_MIME_TYPES = frozenset({
+    "application/zip",
+    "application/vnd.rar",
+    "application/x-7z-compressed",
+    "application/gzip",
+    "application/x-bzip2",
+    "application/x-xz",
+    "application/vnd.android.package-archive",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+})
+
+# Media types under video/, audio/ and image/ that are NOT compressed
+# and still benefit from deflate
+UNCOMPRESSED_MEDIA_TYPES = frozenset({
+    "audio/wav",
+    "audio/aiff",
+    "audio/midi",
+    "image/bmp",
+    "image/tiff",
+    "image/svg+xml",
+})
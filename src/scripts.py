@@ -131,25 +131,14 @@ document.addEventListener('DOMContentLoaded', function() {
         activeUploads++;
         fileProgress[idx] = 0;
 
-        var formData = new FormData();
-        formData.append('file', file);
-
-        var xhr = new XMLHttpRequest();
-
-        // Track upload progress for this file
-        xhr.upload.addEventListener('progress', function(e) {
-          if (e.lengthComputable) {
-            fileProgress[idx] = e.loaded;
-            updateProgress();
-          }
-        });
-
-        // Handle upload completion
-        xhr.addEventListener('load', function() {
+        uploadOne(file, function(loaded) {
+          fileProgress[idx] = loaded;
+          scheduleProgressUpdate();
+        }, function(ok) {
           activeUploads--;
           delete fileProgress[idx];
 
-          if (xhr.status >= 200 && xhr.status < 400) {
+          if (ok) {
             completedFiles++;
             uploadedBytes += file.size;
           } else {
@@ -165,22 +154,22 @@ document.addEventListener('DOMContentLoaded', function() {
             handleAllComplete();
           }
         });
+      }
 
-        // Handle network errors
-        xhr.addEventListener('error', function() {
-          activeUploads--;
-          delete fileProgress[idx];
-          failedFiles.push(file.name);
+      // --- Progress Batching ---
+      // Progress events from parallel uploads are coalesced into one
+      // DOM update per animation frame.
 
-          if (fileIndex < files.length) {
-            uploadNext();
-          } else if (activeUploads === 0) {
-            handleAllComplete();
-          }
-        });
+      var progressScheduled = false;
 
-        xhr.open('POST', window.location.pathname, true);
-        xhr.send(formData);
+      function scheduleProgressUpdate() {
+        if (progressScheduled) return;
+        progressScheduled = true;
+        var schedule = window.requestAnimationFrame || function(f) { setTimeout(f, 16); };
+        schedule(function() {
+          progressScheduled = false;
+          updateProgress();
+        });
       }
 
       // --- Completion Handler ---
@@ -215,6 +204,38 @@ document.addEventListener('DOMContentLoaded', function() {
 
   // Utility Functions
 
+  /**
+   * Upload a single file as multipart/form-data.
+   *
+   * onProgress(loaded) receives the number of file bytes sent so far. The
+   * browser reports progress for the whole multipart body, so it is scaled
+   * down to the file's own size and never exceeds it.
+   * onDone(ok) is called once when the request finishes or fails.
+   */
+  function uploadOne(file, onProgress, onDone) {
+    var formData = new FormData();
+    formData.append('file', file);
+
+    var xhr = new XMLHttpRequest();
+
+    xhr.upload.addEventListener('progress', function(e) {
+      if (e.lengthComputable && e.total > 0) {
+        onProgress(Math.min(file.size, Math.round(file.size * e.loaded / e.total)));
+      }
+    });
+
+    xhr.addEventListener('load', function() {
+      onDone(xhr.status >= 200 && xhr.status < 400);
+    });
+
+    xhr.addEventListener('error', function() {
+      onDone(false);
+    });
+
+    xhr.open('POST', window.location.pathname, true);
+    xhr.send(formData);
+  }
+
   /**
    * Format bytes as human-readable string (e.g., "1.5 MB").
    */
@@ -240,9 +261,15 @@ document.addEventListener('DOMContentLoaded', function() {
 
   if (!sessionId) return;
 
+  // URLs in chat messages, compiled once. Length is capped so adversarial
+  // messages cannot cause pathological matching work.
+  var URL_REGEX = /https?:\\/\\/[^\\s]{1,2048}/g;
+
   // Chat State
   var lastMessageId = null;
   var eventSource = null;
+  var pendingMessages = [];
+  var renderScheduled = false;
   var deviceIdentity = generateDeviceIdentity();
   var SENDER_NAME = deviceIdentity.device_name;
   var DEVICE_ID = deviceIdentity.device_id;
@@ -258,11 +285,16 @@ document.addEventListener('DOMContentLoaded', function() {
   var qrContainer = document.getElementById('qr-container');
   var qrCode = document.getElementById('qr-code');
   var qrUrlText = document.getElementById('qr-url-text');
+  var QR_LIBRARY_URL = 'https://cdn.jsdelivr.net/npm/qrcodejs@1.0.0/qrcode.min.js';
 
   // Initialize Features
+  // Directory size arrives over the chat event stream; fall back to a
+  // one-off request in browsers without EventSource.
   initializeChat();
   initializeQRCode();
-  fetchDirectorySize();
+  if (typeof EventSource === 'undefined') {
+    fetchDirectorySize();
+  }
 
   /**
    * Generate or retrieve persistent device identity.
@@ -648,13 +680,18 @@ document.addEventListener('DOMContentLoaded', function() {
       eventSource.close();
     }
 
+    // Resume from the last message seen so reconnects only receive new ones
     var url = '/api/events?session=' + encodeURIComponent(sessionId);
+    if (lastMessageId) {
+      url += '&since=' + encodeURIComponent(lastMessageId);
+    }
     eventSource = new EventSource(url);
 
     eventSource.onmessage = function(event) {
       try {
         var message = JSON.parse(event.data);
-        renderMessage(message);
+        queueMessage(message);
+        lastMessageId = message.id;
         
         // Update connection status
         if (chatStatus) {
@@ -666,6 +703,14 @@ document.addEventListener('DOMContentLoaded', function() {
       }
     };
 
+    eventSource.addEventListener('size', function(event) {
+      try {
+        showDirectorySize(JSON.parse(event.data));
+      } catch (error) {
+        console.error('Failed to parse size event:', error);
+      }
+    });
+
     eventSource.onerror = function(error) {
       console.error('SSE connection error:', error);
       
@@ -721,11 +766,42 @@ document.addEventListener('DOMContentLoaded', function() {
   }
 
   /**
-   * Render a chat message to the UI.
+   * Queue a chat message for rendering on the next animation frame.
+   * Messages arriving together (e.g. history replay) are rendered in one batch.
+   */
+  function queueMessage(message) {
+    pendingMessages.push(message);
+    if (renderScheduled) return;
+    renderScheduled = true;
+
+    var schedule = window.requestAnimationFrame || function(f) { setTimeout(f, 16); };
+    schedule(function() {
+      renderScheduled = false;
+      var batch = pendingMessages;
+      pendingMessages = [];
+      renderMessages(batch);
+    });
+  }
+
+  /**
+   * Render a batch of chat messages with a single DOM append and scroll.
    */
-  function renderMessage(message) {
-    if (!chatMessages) return;
+  function renderMessages(messages) {
+    if (!chatMessages || messages.length === 0) return;
 
+    var fragment = document.createDocumentFragment();
+    messages.forEach(function(message) {
+      fragment.appendChild(buildMessageNode(message));
+    });
+
+    chatMessages.appendChild(fragment);
+    chatMessages.scrollTop = chatMessages.scrollHeight;
+  }
+
+  /**
+   * Build the DOM node for a single chat message.
+   */
+  function buildMessageNode(message) {
     var messageDiv = document.createElement('div');
     messageDiv.className = 'chat-message';
     
@@ -767,8 +843,7 @@ document.addEventListener('DOMContentLoaded', function() {
     messageDiv.appendChild(contentDiv);
     messageDiv.appendChild(timeDiv);
 
-    chatMessages.appendChild(messageDiv);
-    chatMessages.scrollTop = chatMessages.scrollHeight;
+    return messageDiv;
   }
 
   /**
@@ -784,10 +859,14 @@ document.addEventListener('DOMContentLoaded', function() {
    * Convert URLs in text to clickable links.
    */
   function linkifyUrls(text) {
-    var urlRegex = /(https?:\\/\\/[^\\s]+)/g;
-    return text.replace(urlRegex, function(url) {
-      return '<a href=\"' + url + '\" target=\"_blank\" rel=\"noopener noreferrer\">' + url + '</a>';
-    });
+    return text.replace(URL_REGEX, linkifyMatch);
+  }
+
+  /**
+   * Build the anchor markup for a single matched URL.
+   */
+  function linkifyMatch(url) {
+    return '<a href=\"' + url + '\" target=\"_blank\" rel=\"noopener noreferrer\">' + url + '</a>';
   }
 
   /**
@@ -802,30 +881,54 @@ document.addEventListener('DOMContentLoaded', function() {
 
   /**
    * Initialize QR code generation (desktop only).
+   * The QR library is only downloaded when the QR panel is actually shown,
+   * and the code is generated when the browser is idle.
    */
   function initializeQRCode() {
     if (!qrContainer || !qrCode || !qrUrlText) return;
 
-    // Skip on mobile/tablet
+    // Skip on mobile/tablet, or when the QR panel is hidden
     if (window.innerWidth < 900) return;
+    if (qrContainer.offsetParent === null) return;
 
-    // Wait for QRCode library to load
     if (typeof QRCode === 'undefined') {
-      setTimeout(initializeQRCode, 100);
-      return;
+      var script = document.createElement('script');
+      script.src = QR_LIBRARY_URL;
+      script.async = true;
+      script.onload = scheduleQRCode;
+      document.head.appendChild(script);
+    } else {
+      scheduleQRCode();
     }
+  }
 
-    var currentUrl = window.location.href;
-    
-    // Generate QR code with smaller size for calm aesthetic
-    new QRCode(qrCode, {
-      text: currentUrl,
-      width: 96,
-      height: 96
+  /**
+   * Generate the QR code once the browser is idle.
+   */
+  function scheduleQRCode() {
+    var whenIdle = window.requestIdleCallback || function(f) { setTimeout(f, 0); };
+    whenIdle(function() {
+      var currentUrl = window.location.href;
+
+      // Generate QR code with smaller size for calm aesthetic
+      new QRCode(qrCode, {
+        text: currentUrl,
+        width: 96,
+        height: 96
+      });
+
+      // Display URL text
+      qrUrlText.textContent = currentUrl;
     });
+  }
 
-    // Display URL text
-    qrUrlText.textContent = currentUrl;
+  /**
+   * Display directory size information.
+   */
+  function showDirectorySize(size) {
+    if (!dirSizeInfo) return;
+    dirSizeInfo.textContent = 'Total: ' + size.total_formatted +
+      ' (' + size.file_count + ' files)';
   }
 
   /**
@@ -845,8 +948,7 @@ document.addEventListener('DOMContentLoaded', function() {
       })
       .then(function(data) {
         if (data.size) {
-          dirSizeInfo.textContent = 'Total: ' + data.size.total_formatted + 
-            ' (' + data.size.file_count + ' files)';
+          showDirectorySize(data.size);
         }
       })
       .catch(function(error) {
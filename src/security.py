@@ -11,7 +11,9 @@ This module provides security features for public network deployments:
 - Self-signed certificate generation for HTTPS
 - Security headers for HTTP responses
 
-All features use Python standard library only (no external dependencies).
+All features use the Python standard library. Certificate generation uses
+the `cryptography` package when installed and falls back to the OpenSSL
+command-line tool otherwise.
 """
 
 import os
@@ -22,7 +24,15 @@ import sys
 import threading
 import time
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+
+# Token Limits
+
+# Generated tokens are 16 hex characters; anything longer than this is
+# rejected before the constant-time comparison to bound work under abuse.
+MAX_TOKEN_LENGTH = 64
 
 
 # Rate Limiter
@@ -33,21 +43,31 @@ class _RateLimiter:
     Thread-safe rate limiter using sliding window algorithm.
 
     Tracks requests per IP address and blocks IPs that exceed
-    the configured threshold within the time window.
+    the configured threshold within the time window. check() also drops
+    IPs with no requests inside the window once every sweep interval, so
+    memory stays bounded over long uptimes without a background thread.
     """
 
-    def __init__(self, threshold: int = 200, window_seconds: int = 60) -> None:
+    def __init__(
+        self,
+        threshold: int = 200,
+        window_seconds: int = 60,
+        sweep_interval: float = 300,
+    ) -> None:
         """
         Initialize rate limiter.
 
         Args:
             threshold: Maximum requests allowed per IP within the window.
             window_seconds: Time window in seconds for rate calculation.
+            sweep_interval: Minimum seconds between stale-IP sweeps.
         """
         self.threshold = threshold
         self.window_seconds = window_seconds
+        self.sweep_interval = sweep_interval
         self._requests: Dict[str, List[float]] = {}
         self._lock = threading.Lock()
+        self._next_sweep = time.time() + sweep_interval
 
     def check(self, client_ip: str) -> bool:
         """
@@ -63,6 +83,10 @@ class _RateLimiter:
         cutoff_time = current_time - self.window_seconds
 
         with self._lock:
+            if current_time >= self._next_sweep:
+                self._sweep_locked(cutoff_time)
+                self._next_sweep = current_time + self.sweep_interval
+
             # Get existing requests for this IP
             if client_ip not in self._requests:
                 self._requests[client_ip] = []
@@ -80,6 +104,20 @@ class _RateLimiter:
             self._requests[client_ip].append(current_time)
             return True
 
+    def sweep(self) -> None:
+        """Drop IPs whose most recent request is outside the window."""
+        cutoff_time = time.time() - self.window_seconds
+
+        with self._lock:
+            self._sweep_locked(cutoff_time)
+
+    def _sweep_locked(self, cutoff_time: float) -> None:
+        """Drop IPs with no request after cutoff_time. Caller holds the lock."""
+        # Iterate a snapshot so entries can be deleted safely
+        for client_ip, timestamps in list(self._requests.items()):
+            if not timestamps or timestamps[-1] <= cutoff_time:
+                del self._requests[client_ip]
+
     def get_request_count(self, client_ip: str) -> int:
         """Get current request count for an IP (for logging)."""
         current_time = time.time()
@@ -114,6 +152,7 @@ class _TokenManager:
         self.token_dir = token_dir
         self.token_file = token_dir / "token.txt"
         self._token: Optional[str] = None
+        self._token_bytes: Optional[bytes] = None
 
     def load_or_generate(self) -> str:
         """
@@ -131,6 +170,7 @@ class _TokenManager:
                 token = self.token_file.read_text().strip()
                 if len(token) >= 16:
                     self._token = token
+                    self._token_bytes = token.encode("utf-8")
                     return self._token
         except OSError:
             pass
@@ -146,6 +186,7 @@ class _TokenManager:
             The new authentication token.
         """
         self._token = secrets.token_hex(8)  # 16 hex characters
+        self._token_bytes = self._token.encode("ascii")
 
         # Save to file
         try:
@@ -160,15 +201,26 @@ class _TokenManager:
         """
         Validate a provided token against the stored token.
 
+        Every token is rejected until load_or_generate() has run. The
+        comparison is done on bytes: the stored token is encoded once when
+        loaded, so only the provided value is encoded per request.
+
         Args:
             provided_token: Token to validate.
 
         Returns:
             True if token matches, False otherwise.
         """
-        if self._token is None:
-            self.load_or_generate()
-        return secrets.compare_digest(provided_token or "", self._token or "")
+        if self._token_bytes is None:
+            return False  # Token not loaded; reject rather than fail
+        provided_bytes = (provided_token or "").encode("utf-8", "ignore")
+
+        # Length is independent of the secret, so rejecting early is safe.
+        # A longer token stored on disk raises the cap so it keeps working.
+        max_length = max(MAX_TOKEN_LENGTH, len(self._token_bytes))
+        if not provided_bytes or len(provided_bytes) > max_length:
+            return False
+        return secrets.compare_digest(provided_bytes, self._token_bytes)
 
 
 # Certificate Manager
@@ -178,8 +230,9 @@ class _CertificateManager:
     """
     Manages self-signed certificates for HTTPS.
 
-    Uses OpenSSL subprocess to generate certificates when not available.
-    Falls back gracefully if OpenSSL is not installed.
+    Generates certificates in-process with `cryptography` when installed,
+    otherwise via an OpenSSL subprocess. Falls back gracefully if neither
+    is available.
     """
 
     def __init__(self, cert_dir: Optional[Path] = None) -> None:
@@ -217,7 +270,11 @@ class _CertificateManager:
 
     def _generate_self_signed(self) -> bool:
         """
-        Generate a self-signed certificate using OpenSSL.
+        Generate a self-signed certificate.
+
+        Generates the key and certificate in-process with the optional
+        `cryptography` package when it is installed, avoiding a subprocess
+        and the OpenSSL executable search. Falls back to OpenSSL otherwise.
 
         Returns:
             True if generation succeeded, False otherwise.
@@ -227,6 +284,65 @@ class _CertificateManager:
         except OSError:
             return False
 
+        try:
+            return self._generate_with_cryptography()
+        except ImportError:
+            return self._generate_with_openssl()
+
+    def _generate_with_cryptography(self) -> bool:
+        """
+        Generate a self-signed certificate using the `cryptography` package.
+
+        Returns:
+            True if generation succeeded, False otherwise.
+
+        Raises:
+            ImportError: If `cryptography` is not installed.
+        """
+        import datetime
+
+        from cryptography import x509
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from cryptography.x509.oid import NameOID
+
+        try:
+            # ECDSA P-256: much faster to generate than RSA-2048, smaller handshakes
+            key = ec.generate_private_key(ec.SECP256R1())
+            name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+            now = datetime.datetime.now(datetime.timezone.utc)
+
+            # Self-signed certificate valid for 365 days
+            cert = (
+                x509.CertificateBuilder()
+                .subject_name(name)
+                .issuer_name(name)
+                .public_key(key.public_key())
+                .serial_number(x509.random_serial_number())
+                .not_valid_before(now)
+                .not_valid_after(now + datetime.timedelta(days=365))
+                .sign(key, hashes.SHA256())
+            )
+
+            self.key_file.write_bytes(
+                key.private_bytes(
+                    encoding=serialization.Encoding.PEM,
+                    format=serialization.PrivateFormat.PKCS8,
+                    encryption_algorithm=serialization.NoEncryption(),
+                )
+            )
+            self.cert_file.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def _generate_with_openssl(self) -> bool:
+        """
+        Generate a self-signed certificate using the OpenSSL executable.
+
+        Returns:
+            True if generation succeeded, False otherwise.
+        """
         # Check if OpenSSL is available
         openssl_cmd = "openssl"
         if sys.platform == "win32":
@@ -264,7 +380,7 @@ class _CertificateManager:
             except (OSError, subprocess.TimeoutExpired):
                 return False
 
-        # Generate self-signed certificate (valid for 365 days)
+        # Generate self-signed ECDSA P-256 certificate (valid for 365 days)
         try:
             result = subprocess.run(
                 [
@@ -272,7 +388,9 @@ class _CertificateManager:
                     "req",
                     "-x509",
                     "-newkey",
-                    "rsa:2048",
+                    "ec",
+                    "-pkeyopt",
+                    "ec_paramgen_curve:P-256",
                     "-keyout",
                     str(self.key_file),
                     "-out",
@@ -311,6 +429,9 @@ class SecurityManager:
         """
         Initialize security manager.
 
+        When authentication is enabled, the token is loaded (or generated
+        and persisted) here rather than on the first request.
+
         Args:
             enable_auth: Enable token-based authentication.
             rate_limit_threshold: Max requests per minute per IP.
@@ -320,10 +441,39 @@ class SecurityManager:
             config_dir = Path.home() / ".vortex"
 
         self._rate_limiter = _RateLimiter(threshold=rate_limit_threshold)
-        self._token_manager = _TokenManager(config_dir) if enable_auth else None
+        self._token_manager: Optional[_TokenManager] = None
+        if enable_auth:
+            # Load the token eagerly so no request ever touches the filesystem
+            self._token_manager = _TokenManager(config_dir)
+            self._token_manager.load_or_generate()
         self._cert_manager = _CertificateManager(config_dir)
         self._enable_auth = enable_auth
 
+        # Security headers are static, so build them once per manager
+        headers = {
+            "X-Content-Type-Options": "nosniff",
+            "X-Frame-Options": "DENY",
+            "X-XSS-Protection": "1; mode=block",
+            "Referrer-Policy": "no-referrer",
+            # Strict CSP: Allow inline scripts (required for UI) but block external resources
+            "Content-Security-Policy": (
+                "default-src 'self'; "
+                "script-src 'self' 'unsafe-inline'; "
+                "style-src 'self' 'unsafe-inline'; "
+                "img-src 'self' data:; "
+                "connect-src 'self'; "
+                "font-src 'self'; "
+                "object-src 'none'; "
+                "base-uri 'self'; "
+                "form-action 'self'"
+            ),
+        }
+        # Note: No HSTS - inappropriate for self-signed certs
+        self._security_headers: Mapping[str, str] = MappingProxyType(headers)
+        self._security_header_block = "".join(
+            f"{name}: {value}\r\n" for name, value in headers.items()
+        ).encode("latin-1")
+
     def validate_request(
         self, client_ip: str, provided_token: Optional[str] = None
     ) -> Tuple[bool, str, int]:
@@ -352,36 +502,30 @@ class SecurityManager:
 
         return True, "", 200
 
-    def get_security_headers(self, is_https: bool = False) -> Dict[str, str]:
+    def get_security_headers(self) -> Mapping[str, str]:
         """
         Get security headers for HTTP responses.
 
-        Args:
-            is_https: Whether the connection is HTTPS.
+        The headers are the same for HTTP and HTTPS (no HSTS, see __init__).
+        They are built once and returned as a read-only mapping; callers that
+        need to modify them should copy with dict().
 
         Returns:
-            Dictionary of header names to values.
+            Read-only mapping of header names to values.
         """
-        headers = {
-            "X-Content-Type-Options": "nosniff",
-            "X-Frame-Options": "DENY",
-            "X-XSS-Protection": "1; mode=block",
-            "Referrer-Policy": "no-referrer",
-            # Strict CSP: Allow inline scripts (required for UI) but block external resources
-            "Content-Security-Policy": (
-                "default-src 'self'; "
-                "script-src 'self' 'unsafe-inline'; "
-                "style-src 'self' 'unsafe-inline'; "
-                "img-src 'self' data:; "
-                "connect-src 'self'; "
-                "font-src 'self'; "
-                "object-src 'none'; "
-                "base-uri 'self'; "
-                "form-action 'self'"
-            ),
-        }
-        # Note: No HSTS - inappropriate for self-signed certs
-        return headers
+        return self._security_headers
+
+    def get_security_header_block(self) -> bytes:
+        """
+        Get the security headers as pre-encoded HTTP header lines.
+
+        Same headers as get_security_headers(), encoded once so responses
+        can append them to the header buffer without formatting each line.
+
+        Returns:
+            The "Name: value\\r\\n" lines for every security header.
+        """
+        return self._security_header_block
 
     def get_ssl_context(self) -> Optional[ssl.SSLContext]:
         """
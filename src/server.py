@@ -13,24 +13,42 @@ This module provides the core HTTP server functionality including:
 - Security hardening (path traversal protection, security headers, HTTPS)
 """
 
-import io
+import errno
 import html
 import json
 import os
 import queue
+import re
+import selectors
 import socket
 import ssl
+import stat
+import tempfile
 import threading
 import time
 import uuid
 import zipfile
+from collections import OrderedDict, deque
 from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from email.utils import formatdate
-from hashlib import md5
+from hashlib import blake2b, md5
 from http.server import HTTPServer, SimpleHTTPRequestHandler
+from itertools import islice
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
-from urllib.parse import parse_qs, unquote, urlparse
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+    Union,
+)
+from urllib.parse import quote, unquote, unquote_plus, urlsplit
 
 from .constants import (
     CHUNK_SIZE,
@@ -40,11 +58,25 @@ from .constants import (
     DNS_SERVERS,
     ENCODING,
     FALLBACK_IP,
+    KEEPALIVE_TIMEOUT,
     MAX_WORKERS,
+    ZIP_COMPRESS_LEVEL,
 )
 from .ui import render_directory_listing
 from .upload import UploadResult, extract_boundary, parse_multipart_streaming
-from .utils import generate_etag, get_mime_type, is_path_safe, parse_range_header
+from .utils import (
+    RANGE_NOT_SATISFIABLE,
+    generate_etag,
+    get_mime_type,
+    get_scratch_buffer,
+    is_precompressed,
+    parse_range_header,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 if TYPE_CHECKING:
     from .security import SecurityManager
@@ -53,10 +85,14 @@ if TYPE_CHECKING:
 # Chat Session Storage
 # In-memory storage for cross-device chat messages
 
-_chat_sessions: Dict[str, List[Dict[str, Any]]] = {}
+_chat_sessions: Dict[str, "_ChatSession"] = {}
+_chat_lock = threading.Lock()
 MAX_MESSAGES_PER_SESSION = 100
 MESSAGE_RETENTION_SECONDS = 3600  # 1 hour
 
+# Session ID per served directory (a handful at most)
+_session_ids: Dict[str, str] = {}
+
 # SSE (Server-Sent Events) Infrastructure
 # Real-time message delivery without polling
 
@@ -67,11 +103,13 @@ _sse_lock = threading.Lock()
 # Dedicated rate limiter for chat endpoints to prevent flooding
 
 _chat_rate_limiter = None  # Initialized in run_server
+MAX_JSON_BODY_SIZE = 10000  # Bytes accepted in chat and kick/unkick bodies
 
 # Banned Devices Storage
 # Persistent storage for kicked device IDs
 
 _banned_devices: set = set()
+_banned_devices_lock = threading.Lock()  # Guards updates and persistence
 _BANNED_DEVICES_FILE = Path.home() / ".vortex" / "banned_devices.json"
 
 # Active Devices Tracking
@@ -79,16 +117,96 @@ _BANNED_DEVICES_FILE = Path.home() / ".vortex" / "banned_devices.json"
 
 _active_devices: Dict[str, Dict[str, Any]] = {}
 # Key: device_id, Value: {device_name: str, last_seen: float, session_id: str}
+_active_devices_lock = threading.Lock()
+_last_device_sweep = 0.0  # time.time() of the last stale-device sweep
+DEVICE_TIMEOUT = 60  # Seconds without a request before a device is inactive
+DEVICE_SWEEP_INTERVAL = 10  # Seconds between stale-device sweeps
+DEVICE_REFRESH_INTERVAL = 5  # Seconds before last_seen is updated again
+
+# Filtered device lists keyed by session_id: (time.time() when built, list)
+_active_devices_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+ACTIVE_DEVICES_CACHE_TTL = 1.0  # Seconds a filtered device list is reused
 
 # Directory Size Cache
-# Caches directory size calculations to avoid expensive recomputation
+# LRU of (root mtime_ns, computed_at, size info) keyed by directory path
+
+_size_cache: "OrderedDict[str, Tuple[int, float, Dict[str, Any]]]" = OrderedDict()
+_size_cache_lock = threading.Lock()
+SIZE_CACHE_SIZE = 256
+# Changes to the root directory itself (uploads, deletes, renames) invalidate
+# the cache at once; deeper changes don't touch the root's mtime, so results
+# are also recomputed once they reach this age
+SIZE_CACHE_MAX_AGE = 300  # seconds
+
+# Threads that walk top-level subdirectories concurrently (created lazily)
+_size_walk_executor: Optional[ThreadPoolExecutor] = None
+_size_walk_lock = threading.Lock()
+SIZE_WALK_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+SIZE_WALK_PARALLEL_MIN = 4  # Fewer subdirectories are walked serially
+
+# File Metadata Cache
+# LRU of (etag, encoded static headers) keyed by (path, mtime_ns, size)
+
+_file_meta_cache: "OrderedDict[Tuple[str, int, int], Tuple[str, bytes]]" = OrderedDict()
+_file_meta_lock = threading.Lock()
+FILE_META_CACHE_SIZE = 4096
+
+# Directory Listing Cache
+# LRU of (expires_at, etag, html) keyed by (path, request_path, dir mtime_ns)
+
+_listing_cache: "OrderedDict[Tuple[str, str, int], Tuple[float, str, bytes]]" = (
+    OrderedDict()
+)
+_listing_lock = threading.Lock()
+LISTING_CACHE_SIZE = 64
+LISTING_CACHE_DURATION = 10  # seconds; bounds staleness of file sizes shown
+
+# Small File Cache
+# LRU of file contents for small files, keyed by (path, mtime_ns, size)
+
+_small_file_cache: "OrderedDict[Tuple[str, int, int], bytes]" = OrderedDict()
+_small_file_lock = threading.Lock()
+_small_file_cache_bytes = 0
+SMALL_FILE_MAX_SIZE = 1024 * 1024  # Larger files are always streamed
+SMALL_FILE_CACHE_ENTRIES = 256
+SMALL_FILE_CACHE_BYTES = 64 * 1024 * 1024
 
-_size_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
-SIZE_CACHE_DURATION = 30  # seconds
+# Device Identification
+# device_id cookie within a Cookie header ("a=1; device_id=xyz; b=2")
+
+_DEVICE_ID_COOKIE_RE = re.compile(r"(?:^|;)\s*device_id=([^;]*)")
+
+# Served Directory Prefixes
+# Resolved, case-normalized form of each served directory (a handful at most)
+
+_base_prefixes: Dict[str, str] = {}
 
 # Server Configuration (for host detection)
 _server_display_address: Optional[str] = None
 
+# Zero-copy file sending (Linux, macOS, BSD)
+_HAS_SENDFILE = hasattr(os, "sendfile")
+
+# Positioned reads that need no seek (unavailable on Windows)
+_HAS_PREADV = hasattr(os, "preadv")
+
+# Readahead hints for streamed files (POSIX only)
+_HAS_FADVISE = hasattr(os, "posix_fadvise")
+READAHEAD_HINT_SIZE = 4 * CHUNK_SIZE  # Bytes prefetched when streaming starts
+
+# Scatter/gather socket writes (unavailable on Windows)
+_HAS_SENDMSG = hasattr(socket.socket, "sendmsg")
+
+# Socket option for coalescing headers and body into full TCP segments:
+# TCP_CORK on Linux, TCP_NOPUSH on BSD/macOS, unavailable on Windows
+_TCP_CORK_OPTION: Optional[int] = getattr(
+    socket, "TCP_CORK", getattr(socket, "TCP_NOPUSH", None)
+)
+
+# Cap on unsent data queued in the kernel per socket (Linux, macOS)
+_TCP_NOTSENT_LOWAT_OPTION: Optional[int] = getattr(socket, "TCP_NOTSENT_LOWAT", None)
+TCP_NOTSENT_LOWAT = 128 * 1024
+
 
 # Chat Helper Functions
 
@@ -116,14 +234,31 @@ def _save_banned_devices() -> None:
     Save banned device IDs to persistent storage.
 
     Saves to ~/.vortex/banned_devices.json.
-    Creates directory if it doesn't exist.
+    Creates directory if it doesn't exist. The list is written to a
+    temporary file, flushed to disk and renamed over the old one, so a
+    crash mid-write leaves the previous list intact. Caller must hold
+    _banned_devices_lock.
     """
+    temp_path = None
     try:
         _BANNED_DEVICES_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(_BANNED_DEVICES_FILE, 'w', encoding='utf-8') as f:
+        temp_fd, temp_path = tempfile.mkstemp(
+            dir=_BANNED_DEVICES_FILE.parent, prefix=".banned_devices_"
+        )
+        with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
             json.dump(list(_banned_devices), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, _BANNED_DEVICES_FILE)
+        temp_path = None
     except OSError:
         pass  # Non-critical if we can't persist
+    finally:
+        if temp_path is not None:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
 
 
 def _register_active_device(
@@ -134,24 +269,52 @@ def _register_active_device(
     """
     Register or update an active device.
 
+    Runs on every request from a known device, so an unchanged entry is
+    only refreshed every DEVICE_REFRESH_INTERVAL seconds, and checking
+    that takes no lock.
+
     Args:
         device_id: Unique device identifier.
         device_name: Human-readable device name.
         session_id: Current session identifier.
     """
-    _active_devices[device_id] = {
-        "device_name": device_name,
-        "device_id": device_id,
-        "last_seen": time.time(),
-        "session_id": session_id
-    }
+    now = time.time()
+
+    # Lock-free read: entries are replaced, never mutated, so a stale
+    # read costs at most one extra refresh
+    info = _active_devices.get(device_id)
+    if (
+        info is not None
+        and now - info["last_seen"] < DEVICE_REFRESH_INTERVAL
+        and info["session_id"] == session_id
+        and info["device_name"] == device_name
+    ):
+        return
+
+    with _active_devices_lock:
+        # A joining or changed device must show up in the next listing
+        if info is None or info["device_name"] != device_name:
+            _active_devices_cache.pop(session_id, None)
+        elif info["session_id"] != session_id:
+            _active_devices_cache.pop(info["session_id"], None)
+            _active_devices_cache.pop(session_id, None)
+
+        _active_devices[device_id] = {
+            "device_name": device_name,
+            "device_id": device_id,
+            "last_seen": now,
+            "session_id": session_id
+        }
 
 
 def _get_active_devices(session_id: str) -> List[Dict[str, Any]]:
     """
     Get list of active devices for a session.
 
-    Filters out devices inactive for more than 60 seconds.
+    Filters out devices inactive for more than DEVICE_TIMEOUT seconds.
+    Stale entries are only deleted every DEVICE_SWEEP_INTERVAL seconds;
+    in between they are just skipped. The filtered list is reused for
+    ACTIVE_DEVICES_CACHE_TTL seconds unless a device joins the session.
 
     Args:
         session_id: Session identifier.
@@ -159,62 +322,131 @@ def _get_active_devices(session_id: str) -> List[Dict[str, Any]]:
     Returns:
         List of active device dictionaries.
     """
-    now = time.time()
-    cutoff = now - 60  # 60 second timeout
+    global _last_device_sweep
 
-    # Clean up stale devices
-    stale_devices = [
-        did for did, info in _active_devices.items()
-        if info["last_seen"] < cutoff
-    ]
-    for did in stale_devices:
-        del _active_devices[did]
-
-    # Return active devices for this session
-    return [
-        info for info in _active_devices.values()
-        if info["session_id"] == session_id
-    ]
+    now = time.time()
+    cutoff = now - DEVICE_TIMEOUT
+
+    with _active_devices_lock:
+        cached = _active_devices_cache.get(session_id)
+        if cached is not None and now - cached[0] < ACTIVE_DEVICES_CACHE_TTL:
+            return cached[1]
+
+        # Clean up stale devices
+        if now - _last_device_sweep >= DEVICE_SWEEP_INTERVAL:
+            _last_device_sweep = now
+            stale_devices = [
+                did for did, info in _active_devices.items()
+                if info["last_seen"] < cutoff
+            ]
+            for did in stale_devices:
+                del _active_devices[did]
+            _active_devices_cache.clear()
+
+        # Return active devices for this session
+        devices = [
+            info for info in _active_devices.values()
+            if info["session_id"] == session_id and info["last_seen"] >= cutoff
+        ]
+        _active_devices_cache[session_id] = (now, devices)
+        return devices
 
 
 def _get_session_id(directory_path: str) -> str:
     """
     Generate a stable session ID from directory path.
 
+    The ID depends only on the path, so it is computed once per served
+    directory and then looked up.
+
     Args:
         directory_path: Absolute path to the directory being served.
 
     Returns:
-        MD5 hash of the directory path as session identifier.
+        16 hex digit BLAKE2b hash of the directory path.
+    """
+    session_id = _session_ids.get(directory_path)
+    if session_id is None:
+        session_id = blake2b(
+            directory_path.encode(ENCODING, "surrogateescape"), digest_size=8
+        ).hexdigest()
+        _session_ids[directory_path] = session_id
+    return session_id
+
+
+class _ChatSession:
     """
-    return md5(directory_path.encode()).hexdigest()[:16]
+    Messages of one chat session, oldest first, indexed by message ID.
+
+    Every message gets a sequence number when it is added. A message's
+    position is its sequence number minus the oldest message's, so the
+    messages after a given ID are found with one dict lookup. Callers
+    must hold _chat_lock.
+
+    Attributes:
+        messages: Message dictionaries in the order they were added.
+    """
+
+    __slots__ = ("messages", "_seq_by_id", "_first_seq")
+
+    def __init__(self) -> None:
+        """Initialize an empty session."""
+        self.messages: Deque[Dict[str, Any]] = deque()
+        self._seq_by_id: Dict[str, int] = {}
+        self._first_seq = 0  # Sequence number of messages[0]
+
+    def append(self, message: Dict[str, Any]) -> None:
+        """Add a message, dropping the oldest beyond MAX_MESSAGES_PER_SESSION."""
+        if len(self.messages) >= MAX_MESSAGES_PER_SESSION:
+            self.popleft()
+        self._seq_by_id[message["id"]] = self._first_seq + len(self.messages)
+        self.messages.append(message)
+
+    def popleft(self) -> None:
+        """Drop the oldest message."""
+        message = self.messages.popleft()
+        del self._seq_by_id[message["id"]]
+        self._first_seq += 1
+
+    def after(self, message_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the messages added after a message.
+
+        Args:
+            message_id: ID of a message in this session.
+
+        Returns:
+            The later messages, or None if message_id is not (or no
+            longer) in the session.
+        """
+        seq = self._seq_by_id.get(message_id)
+        if seq is None:
+            return None
+        return list(islice(self.messages, seq - self._first_seq + 1, None))
 
 
 def _cleanup_old_messages(session_id: str) -> None:
     """
     Remove old messages from a chat session.
 
-    Removes messages older than MESSAGE_RETENTION_SECONDS and
-    trims to MAX_MESSAGES_PER_SESSION.
+    Removes messages older than MESSAGE_RETENTION_SECONDS. Messages are
+    appended in time order, so expired ones are always at the front;
+    _ChatSession itself enforces MAX_MESSAGES_PER_SESSION. Caller must
+    hold _chat_lock.
 
     Args:
         session_id: Session identifier to clean up.
     """
-    if session_id not in _chat_sessions:
+    session = _chat_sessions.get(session_id)
+    if session is None:
         return
 
     now = time.time()
-    messages = _chat_sessions[session_id]
+    messages = session.messages
 
     # Remove expired messages
-    messages[:] = [
-        msg for msg in messages
-        if now - msg["timestamp"] < MESSAGE_RETENTION_SECONDS
-    ]
-
-    # Trim to maximum count
-    if len(messages) > MAX_MESSAGES_PER_SESSION:
-        messages[:] = messages[-MAX_MESSAGES_PER_SESSION:]
+    while messages and now - messages[0]["timestamp"] >= MESSAGE_RETENTION_SECONDS:
+        session.popleft()
 
 
 def _add_message(
@@ -235,9 +467,6 @@ def _add_message(
     Returns:
         The created message dictionary.
     """
-    if session_id not in _chat_sessions:
-        _chat_sessions[session_id] = []
-
     # XSS Prevention: Escape all user-provided content
     message = {
         "id": str(uuid.uuid4()),
@@ -251,8 +480,12 @@ def _add_message(
     if device_id:
         message["device_id"] = html.escape(device_id)
 
-    _chat_sessions[session_id].append(message)
-    _cleanup_old_messages(session_id)
+    with _chat_lock:
+        session = _chat_sessions.get(session_id)
+        if session is None:
+            session = _chat_sessions[session_id] = _ChatSession()
+        session.append(message)
+        _cleanup_old_messages(session_id)
     
     # Broadcast to SSE clients
     _broadcast_message_to_sse(session_id, message)
@@ -286,6 +519,24 @@ def _broadcast_message_to_sse(session_id: str, message: Dict[str, Any]) -> None:
             _sse_queues[session_id].remove(dq)
 
 
+def _format_sse_event(message: Dict[str, Any]) -> bytes:
+    """
+    Encode a chat message as a single SSE frame.
+
+    The message ID is sent as the event ID so reconnecting clients can
+    resume from the last message they received.
+
+    Args:
+        message: Message dictionary to encode.
+
+    Returns:
+        The encoded ``id:``/``data:`` frame.
+    """
+    return b"id: %s\ndata: %s\n\n" % (
+        message["id"].encode(ENCODING), _json_dumps(message)
+    )
+
+
 def _register_sse_client(session_id: str, client_queue: queue.Queue) -> None:
     """
     Register a new SSE client for a session.
@@ -329,32 +580,89 @@ def _get_messages(
     Returns:
         List of message dictionaries.
     """
-    if session_id not in _chat_sessions:
-        return []
+    with _chat_lock:
+        if session_id not in _chat_sessions:
+            return []
 
-    _cleanup_old_messages(session_id)
-    messages = _chat_sessions[session_id]
+        _cleanup_old_messages(session_id)
+        session = _chat_sessions[session_id]
 
-    if since_id:
-        # Find the index of since_id and return messages after it
-        for i, msg in enumerate(messages):
-            if msg["id"] == since_id:
-                return messages[i + 1:]
-        # If since_id not found, return all recent messages
-        return messages
+        if since_id:
+            # Return only the messages after since_id, if we still have it
+            later = session.after(since_id)
+            if later is not None:
+                return later
 
-    return messages
+        # No since_id, or not found: return all recent messages (as a copy)
+        return list(session.messages)
 
 
 # Directory Size Helper
 
 
+def _walk_directory(directory_path: str) -> Tuple[int, int, int]:
+    """
+    Sum file sizes beneath a directory.
+
+    Iterative scandir walk: DirEntry type checks reuse the d_type from
+    readdir, so only the size lookup costs a stat() per file.
+
+    Args:
+        directory_path: Directory to walk.
+
+    Returns:
+        Tuple of (total_bytes, file_count, folder_count), not counting
+        directory_path itself.
+    """
+    total_bytes = 0
+    file_count = 0
+    folder_count = 0
+
+    pending = [directory_path]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue  # Skip inaccessible directories
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        total_bytes += entry.stat().st_size
+                        file_count += 1
+                    elif entry.is_dir():
+                        folder_count += 1
+                        # Count symlinked directories but don't descend
+                        if not entry.is_symlink():
+                            pending.append(entry.path)
+                except OSError:
+                    # Skip inaccessible files
+                    continue
+
+    return total_bytes, file_count, folder_count
+
+
+def _get_size_walk_executor() -> ThreadPoolExecutor:
+    """Get the shared executor for directory size walks, creating it lazily."""
+    global _size_walk_executor
+    with _size_walk_lock:
+        if _size_walk_executor is None:
+            _size_walk_executor = ThreadPoolExecutor(
+                max_workers=SIZE_WALK_WORKERS, thread_name_prefix="vortex-size"
+            )
+        return _size_walk_executor
+
+
 def _calculate_directory_size(directory_path: str) -> Dict[str, Any]:
     """
     Calculate total size of a directory.
 
-    Walks the directory tree and sums file sizes. Caches result
-    for SIZE_CACHE_DURATION to avoid expensive recalculation.
+    Walks the directory tree and sums file sizes. The result is cached
+    until the directory's own mtime changes or it is SIZE_CACHE_MAX_AGE
+    seconds old, so repeat calls usually cost a single stat().
+
+    Top-level subdirectories are walked concurrently, so the stat()
+    latency of separate subtrees overlaps on slow or network storage.
 
     Args:
         directory_path: Path to directory to calculate.
@@ -364,10 +672,21 @@ def _calculate_directory_size(directory_path: str) -> Dict[str, Any]:
     """
     # Check cache first
     now = time.time()
-    if directory_path in _size_cache:
-        cached_time, cached_data = _size_cache[directory_path]
-        if now - cached_time < SIZE_CACHE_DURATION:
-            return cached_data
+    try:
+        root_mtime_ns = os.stat(directory_path).st_mtime_ns
+    except OSError:
+        root_mtime_ns = -1
+
+    with _size_cache_lock:
+        cached = _size_cache.get(directory_path)
+        if cached is not None:
+            cached_mtime_ns, cached_time, cached_data = cached
+            if (
+                cached_mtime_ns == root_mtime_ns
+                and now - cached_time < SIZE_CACHE_MAX_AGE
+            ):
+                _size_cache.move_to_end(directory_path)
+                return cached_data
 
     # Import format_size from ui module
     from .ui import format_size
@@ -376,21 +695,34 @@ def _calculate_directory_size(directory_path: str) -> Dict[str, Any]:
     file_count = 0
     folder_count = 0
 
+    # Scan the root here; its subdirectories become independent walks
+    subdirectories: List[str] = []
     try:
-        dir_path = Path(directory_path)
-        for entry in dir_path.rglob("*"):
-            try:
-                if entry.is_file():
-                    total_bytes += entry.stat().st_size
-                    file_count += 1
-                elif entry.is_dir():
-                    folder_count += 1
-            except (OSError, PermissionError):
-                # Skip inaccessible files
-                continue
-    except (OSError, PermissionError):
+        with os.scandir(directory_path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        total_bytes += entry.stat().st_size
+                        file_count += 1
+                    elif entry.is_dir():
+                        folder_count += 1
+                        if not entry.is_symlink():
+                            subdirectories.append(entry.path)
+                except OSError:
+                    continue
+    except OSError:
         pass
 
+    if len(subdirectories) < SIZE_WALK_PARALLEL_MIN:
+        subtotals = map(_walk_directory, subdirectories)
+    else:
+        subtotals = _get_size_walk_executor().map(_walk_directory, subdirectories)
+
+    for sub_bytes, sub_files, sub_folders in subtotals:
+        total_bytes += sub_bytes
+        file_count += sub_files
+        folder_count += sub_folders
+
     result = {
         "total_bytes": total_bytes,
         "total_formatted": format_size(total_bytes),
@@ -399,27 +731,484 @@ def _calculate_directory_size(directory_path: str) -> Dict[str, Any]:
     }
 
     # Cache the result
-    _size_cache[directory_path] = (now, result)
+    with _size_cache_lock:
+        _size_cache[directory_path] = (root_mtime_ns, now, result)
+        _size_cache.move_to_end(directory_path)
+        if len(_size_cache) > SIZE_CACHE_SIZE:
+            _size_cache.popitem(last=False)
 
     return result
 
 
+# Response Status Lines
+# Status line plus Server header per (protocol, status code), and the Date
+# header, which only changes once a second
+
+_status_blocks: Dict[Tuple[str, int], bytes] = {}
+_date_header: Tuple[int, bytes] = (0, b"")
+
+
+def _get_date_header() -> bytes:
+    """
+    Get the encoded Date header line for the current second.
+
+    Returns:
+        The complete "Date: ...\r\n" line.
+    """
+    global _date_header
+
+    now = int(time.time())
+    cached = _date_header  # Read once; another thread may replace it
+    if cached[0] == now:
+        return cached[1]
+    line = b"Date: %s\r\n" % formatdate(now, usegmt=True).encode("latin-1")
+    _date_header = (now, line)
+    return line
+
+
+# Security headers sent when no security manager is configured
+_BASIC_SECURITY_HEADERS = (
+    b"X-Content-Type-Options: nosniff\r\n"
+    b"X-Frame-Options: DENY\r\n"
+)
+
+# JSON Encoding
+
+# Encoded {"error": message} bodies (messages are fixed strings)
+_error_bodies: Dict[str, bytes] = {}
+
+
+def _json_dumps(data: Any) -> bytes:
+    """
+    Serialize data to UTF-8 encoded JSON.
+
+    Uses the optional orjson package when it is installed, which encodes
+    straight to bytes several times faster than the json module. Both
+    leave non-ASCII text unescaped.
+
+    Args:
+        data: JSON-serializable value.
+
+    Returns:
+        The encoded JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode(ENCODING)
+
+
+# Chunked Transfer Encoding
+
+
+def _sendmsg_all(connection: socket.socket, buffers: List[Any]) -> None:
+    """
+    Send several buffers back to back using scatter/gather sendmsg().
+
+    Handles partial sends by resuming from where the kernel stopped, so
+    the buffers go out in as few syscalls as possible without first being
+    joined into one copy. Only for plain (non-TLS) sockets.
+
+    Args:
+        connection: The client socket.
+        buffers: Bytes-like objects to send, in order.
+    """
+    views = [memoryview(buf) for buf in buffers]
+    while views:
+        sent = connection.sendmsg(views)
+        while views and sent >= views[0].nbytes:
+            sent -= views.pop(0).nbytes
+        if sent:
+            views[0] = views[0][sent:]
+
+
+class _ChunkedWriter:
+    """
+    Write-only file object that frames data with HTTP chunked encoding.
+
+    Used to stream archives whose size isn't known in advance. Small
+    writes (zipfile emits a few KB at a time) are buffered and sent as
+    chunks of up to CHUNK_SIZE bytes. On plain sockets each chunk's size
+    line, data and trailing CRLF go out in a single sendmsg() call.
+    """
+
+    def __init__(self, wfile: Any, connection: Optional[socket.socket] = None) -> None:
+        """
+        Initialize the writer.
+
+        Args:
+            wfile: The handler's output stream.
+            connection: The client socket, enabling sendmsg() when it is a
+                plain socket. If None, everything goes through wfile.
+        """
+        self._wfile = wfile
+        self._buffer = bytearray()
+        self._connection = None
+        if _HAS_SENDMSG and not isinstance(connection, ssl.SSLSocket):
+            self._connection = connection
+
+    def write(self, data: bytes) -> int:
+        """Buffer data, sending a chunk once CHUNK_SIZE bytes are pending."""
+        self._buffer += data
+        if len(self._buffer) >= CHUNK_SIZE:
+            self._send_chunk()
+        return len(data)
+
+    def flush(self) -> None:
+        """No-op; data is sent in full chunks or by finish()."""
+
+    def finish(self) -> None:
+        """Send any buffered data followed by the terminating chunk."""
+        self._send_chunk(b"0\r\n\r\n")
+
+    def _send_chunk(self, trailer: bytes = b"") -> None:
+        """
+        Send the buffered data as one chunk.
+
+        Args:
+            trailer: Bytes to send right after the chunk (e.g. the
+                terminating chunk), in the same call.
+        """
+        parts = [trailer]
+        if self._buffer:
+            parts = [b"%X\r\n" % len(self._buffer), self._buffer, b"\r\n" + trailer]
+        if self._connection is not None:
+            _sendmsg_all(self._connection, parts)
+        else:
+            for part in parts:
+                if part:
+                    self._wfile.write(part)
+        # New buffer rather than clear(): the old one may still be exported
+        self._buffer = bytearray()
+
+
+class _RawWriter(_ChunkedWriter):
+    """
+    Write-only file object that sends data without chunk framing.
+
+    For HTTP/1.0 clients, which don't understand chunked encoding: the
+    body is delimited by closing the connection instead.
+    """
+
+    def finish(self) -> None:
+        """Send any buffered data."""
+        self._send_chunk()
+
+    def _send_chunk(self, trailer: bytes = b"") -> None:
+        """Send the buffered data as-is."""
+        if not self._buffer:
+            return
+        if self._connection is not None:
+            self._connection.sendall(self._buffer)
+        else:
+            self._wfile.write(self._buffer)
+        self._buffer = bytearray()
+
+
+# File Metadata Cache
+
+
+def _content_disposition(disposition: str, filename: str) -> str:
+    """
+    Build a Content-Disposition value that is safe for any filename.
+
+    Header values must be Latin-1 and free of control characters. Names
+    that are not plain printable ASCII get an ASCII fallback plus an
+    RFC 6266 ``filename*`` parameter carrying the UTF-8 name.
+
+    Args:
+        disposition: "inline" or "attachment".
+        filename: The file name to suggest to the client.
+
+    Returns:
+        The header value.
+    """
+    fallback = "".join(
+        c if " " <= c < "\x7f" and c not in '"\\' else "_" for c in filename
+    )
+    if fallback == filename:
+        return f'{disposition}; filename="{filename}"'
+    encoded = quote(filename, safe="", errors="surrogateescape")
+    return f"{disposition}; filename=\"{fallback}\"; filename*=UTF-8''{encoded}"
+
+
+def _get_file_etag(path: str, file_stat: os.stat_result) -> str:
+    """
+    Get the ETag for a file without building its response headers.
+
+    Used to answer conditional requests: a 304 needs only the ETag, so a
+    cache miss here does not format and encode headers that are never sent.
+
+    Args:
+        path: Filesystem path of the file.
+        file_stat: Result of os.stat() on the file.
+
+    Returns:
+        ETag string in quotes.
+    """
+    # The lock guards against concurrent reordering (needed without the GIL);
+    # the LRU order is left alone and a miss only costs computing the ETag
+    with _file_meta_lock:
+        cached = _file_meta_cache.get((path, file_stat.st_mtime_ns, file_stat.st_size))
+    if cached is not None:
+        return cached[0]
+    return generate_etag(path, file_stat)
+
+
+def _get_file_metadata(path: str, file_stat: os.stat_result) -> Tuple[str, bytes]:
+    """
+    Get the ETag and the pre-encoded static response headers for a file.
+
+    The static headers are every file response header that depends only on
+    the file version: Content-Type, Accept-Ranges, ETag, Last-Modified,
+    Cache-Control and Content-Disposition. They are encoded once into a
+    single bytes block, so a response only formats its status line,
+    Content-Length and Content-Range.
+
+    Results are cached per (path, mtime, size), so repeated requests for
+    the same file (e.g. Range requests while seeking in a video) skip the
+    lookups, hashing and formatting. A modified file gets a new key, so
+    stale entries are never returned and simply age out of the cache.
+
+    Args:
+        path: Filesystem path of the file.
+        file_stat: Result of os.stat() on the file.
+
+    Returns:
+        Tuple of (etag, static_headers).
+    """
+    key = (path, file_stat.st_mtime_ns, file_stat.st_size)
+
+    with _file_meta_lock:
+        cached = _file_meta_cache.get(key)
+        if cached is not None:
+            _file_meta_cache.move_to_end(key)
+            return cached
+
+    etag = generate_etag(path, file_stat)
+    disposition = _content_disposition("inline", os.path.basename(path))
+    static_headers = (
+        f"Content-Type: {get_mime_type(path)}\r\n"
+        "Accept-Ranges: bytes\r\n"
+        f"ETag: {etag}\r\n"
+        f"Last-Modified: {formatdate(file_stat.st_mtime, usegmt=True)}\r\n"
+        "Cache-Control: public, max-age=3600\r\n"
+        f"Content-Disposition: {disposition}\r\n"
+    ).encode("latin-1")
+    metadata = (etag, static_headers)
+
+    with _file_meta_lock:
+        _file_meta_cache[key] = metadata
+        if len(_file_meta_cache) > FILE_META_CACHE_SIZE:
+            _file_meta_cache.popitem(last=False)
+
+    return metadata
+
+
+def _get_directory_listing(
+    base_directory: str, path: str, request_path: str, dir_stat: os.stat_result
+) -> Tuple[str, bytes]:
+    """
+    Get the rendered directory listing page and its ETag.
+
+    Pages are cached per (path, request path, directory mtime), so
+    repeated navigation skips the directory scan and rendering. Adding,
+    removing or renaming entries changes the directory mtime and so the
+    key. Files modified in place do not, so entries also expire after
+    LISTING_CACHE_DURATION to keep displayed sizes current.
+
+    The ETag is a hash of the page itself, so a 304 is only ever sent
+    when the client already has exactly this page.
+
+    Args:
+        base_directory: Root directory being served.
+        path: Filesystem path of the directory.
+        request_path: URL path of the request.
+        dir_stat: Result of os.stat() on the directory.
+
+    Returns:
+        Tuple of (etag, encoded_html).
+    """
+    key = (path, request_path, dir_stat.st_mtime_ns)
+    now = time.monotonic()
+
+    with _listing_lock:
+        cached = _listing_cache.get(key)
+        if cached is not None and cached[0] > now:
+            _listing_cache.move_to_end(key)
+            return cached[1], cached[2]
+
+    session_id = _get_session_id(base_directory)
+    page = render_directory_listing(
+        base_directory, path, request_path, session_id
+    ).encode(ENCODING, "surrogateescape")
+    etag = f'"{md5(page).hexdigest()[:16]}"'
+
+    with _listing_lock:
+        _listing_cache[key] = (now + LISTING_CACHE_DURATION, etag, page)
+        _listing_cache.move_to_end(key)
+        if len(_listing_cache) > LISTING_CACHE_SIZE:
+            _listing_cache.popitem(last=False)
+
+    return etag, page
+
+
+def _get_small_file(path: str, file_stat: os.stat_result) -> Optional[bytes]:
+    """
+    Get the contents of a small file from memory.
+
+    Small, frequently requested files (icons, thumbnails, scripts) are
+    dominated by the open/read/close cost rather than by the transfer.
+    Their contents are kept in an LRU bounded by entry count and total
+    size, keyed by (path, mtime, size) so a modified file is re-read.
+
+    Contents are copied into memory rather than mmap'd, so a file that is
+    truncated while cached cannot crash the server with SIGBUS.
+
+    Args:
+        path: Filesystem path of the file.
+        file_stat: Result of os.stat() on the file.
+
+    Returns:
+        The file contents, or None if the file is too large or could not
+        be read consistently (the caller should stream it instead).
+    """
+    global _small_file_cache_bytes
+
+    if file_stat.st_size >= SMALL_FILE_MAX_SIZE:
+        return None
+
+    key = (path, file_stat.st_mtime_ns, file_stat.st_size)
+
+    with _small_file_lock:
+        cached = _small_file_cache.get(key)
+        if cached is not None:
+            _small_file_cache.move_to_end(key)
+            return cached
+
+    try:
+        with open(path, "rb") as f:
+            content = f.read(SMALL_FILE_MAX_SIZE)
+    except OSError:
+        return None
+
+    # File changed between stat and read; don't cache a mismatched version
+    if len(content) != file_stat.st_size:
+        return None
+
+    with _small_file_lock:
+        if key not in _small_file_cache:
+            _small_file_cache[key] = content
+            _small_file_cache_bytes += len(content)
+            while (
+                len(_small_file_cache) > SMALL_FILE_CACHE_ENTRIES
+                or _small_file_cache_bytes > SMALL_FILE_CACHE_BYTES
+            ):
+                _, evicted = _small_file_cache.popitem(last=False)
+                _small_file_cache_bytes -= len(evicted)
+
+    return content
+
+
+# Query Strings
+
+
+def _parse_query(query: str) -> Dict[str, str]:
+    """
+    Parse a URL query string into a flat dict.
+
+    Stand-in for urllib.parse.parse_qs() for the handful of known keys the
+    handlers read: the first value of each key is kept, blank values are
+    dropped as parse_qs does, and only escaped fields are unquoted.
+
+    Args:
+        query: Raw query string, without the leading "?".
+
+    Returns:
+        Dict mapping each key to its first non-empty value.
+    """
+    params: Dict[str, str] = {}
+    for field in query.split("&"):
+        key, _, value = field.partition("=")
+        if not value:
+            continue
+        if "%" in key or "+" in key:
+            key = unquote_plus(key)
+        if key in params:
+            continue
+        if "%" in value or "+" in value:
+            value = unquote_plus(value)
+        params[key] = value
+    return params
+
+
+# Path Containment
+
+
+def _is_within_base(path: str, base_directory: str) -> bool:
+    """
+    Check that a path resolves to somewhere inside the served directory.
+
+    String-level equivalent of utils.is_path_safe() for the request hot
+    path: the request path is resolved with os.path.realpath() and compared
+    by prefix, and the served directory is only resolved once per process.
+
+    Args:
+        path: Filesystem path to validate.
+        base_directory: Root directory being served.
+
+    Returns:
+        True if path is base_directory or lies beneath it.
+    """
+    prefix = _base_prefixes.get(base_directory)
+    if prefix is None:
+        real_base = os.path.normcase(os.path.realpath(base_directory))
+        prefix = real_base.rstrip(os.sep) + os.sep
+        _base_prefixes[base_directory] = prefix
+
+    try:
+        real_path = os.path.normcase(os.path.realpath(path))
+    except (OSError, ValueError):
+        return False
+    return real_path.startswith(prefix) or real_path + os.sep == prefix
+
+
 # Thread Pool Server
 
 
+# Response sent to connections shed while every worker is busy
+_OVERLOADED_RESPONSE = (
+    b"HTTP/1.1 503 Service Unavailable\r\n"
+    b"Content-Length: 0\r\n"
+    b"Retry-After: 1\r\n"
+    b"Connection: close\r\n\r\n"
+)
+
+
 class PooledHTTPServer(HTTPServer):
     """
     HTTP server using a thread pool for controlled concurrency.
 
-    Uses ThreadPoolExecutor to limit maximum concurrent connections,
-    preventing resource exhaustion under high load while maintaining
-    high throughput for file transfers.
+    Accepted connections go into a bounded queue served by up to
+    max_workers worker threads, started on demand. When the queue is
+    full the connection is shed with a 503 instead of waiting behind an
+    unbounded backlog, which keeps latency predictable under overload.
+
+    Plain HTTP connections are parked whenever they are idle, on accept
+    and between keep-alive requests: a single watcher thread waits on
+    all of them with a selector and queues a connection only once its
+    next request arrives. Idle clients therefore hold no worker thread,
+    so far more of them than max_workers can stay connected.
 
     Attributes:
-        executor: Thread pool for handling requests.
         allow_reuse_address: Enables socket reuse to avoid bind errors.
+        request_queue_size: Listen backlog; sized for connection bursts
+            (browsers open several connections per page, and many
+            devices may upload at once) so SYNs are not dropped.
     """
 
+    allow_reuse_address = True
+    request_queue_size = socket.SOMAXCONN
+
     def __init__(
         self,
         server_address: Tuple[str, int],
@@ -435,31 +1224,189 @@ class PooledHTTPServer(HTTPServer):
             max_workers: Maximum concurrent connections (default: 100).
         """
         super().__init__(server_address, RequestHandlerClass)
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
-        self.allow_reuse_address = True
+        self._max_workers = max_workers
+        # Accepted (request, client_address) pairs; None tells a worker to exit
+        self._pending: queue.Queue = queue.Queue(maxsize=max_workers * 2)
+        self._workers: List[threading.Thread] = []
+        self._idle_workers = threading.Semaphore(0)
         self._shutdown_flag = False
 
+        # Idle keep-alive connections, handed to the watcher via _parking
+        self._parking: List[Tuple[socket.socket, Tuple[str, int]]] = []
+        self._parking_lock = threading.Lock()
+        self._idle_selector = selectors.DefaultSelector()
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_recv.setblocking(False)
+        self._wakeup_send.setblocking(False)
+        self._idle_selector.register(self._wakeup_recv, selectors.EVENT_READ)
+        self._idle_watcher: Optional[threading.Thread] = None
+
     def process_request(
         self, request: socket.socket, client_address: Tuple[str, int]
     ) -> None:
-        """Submit request to thread pool instead of blocking."""
-        if not self._shutdown_flag:
-            self.executor.submit(
-                self._process_request_thread, request, client_address
+        """Park a new connection until its first request arrives."""
+        if isinstance(request, ssl.SSLSocket):
+            # The request may already sit decrypted in the TLS buffer
+            self._dispatch_request(request, client_address)
+        else:
+            self._park_connection(request, client_address)
+
+    def _dispatch_request(
+        self, request: socket.socket, client_address: Tuple[str, int]
+    ) -> None:
+        """
+        Queue the connection for a worker, shedding it if the queue is full.
+
+        Only ever called from one thread: the idle watcher for plain HTTP,
+        the accept loop for HTTPS.
+        """
+        if self._shutdown_flag:
+            self.shutdown_request(request)
+            return
+
+        try:
+            self._pending.put_nowait((request, client_address))
+        except queue.Full:
+            self._shed_request(request)
+            return
+
+        # Start another worker unless one is idle (as ThreadPoolExecutor does)
+        if self._idle_workers.acquire(blocking=False):
+            return
+        if len(self._workers) < self._max_workers:
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f"vortex-worker-{len(self._workers)}",
+                daemon=True,
             )
+            worker.start()
+            self._workers.append(worker)
+
+    def _worker_loop(self) -> None:
+        """Serve queued connections until a None sentinel arrives."""
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            self._process_request_thread(*item)
+            self._idle_workers.release()
+
+    def _shed_request(self, request: socket.socket) -> None:
+        """Reject a connection with 503 without blocking the accept loop."""
+        try:
+            request.setblocking(False)
+            request.send(_OVERLOADED_RESPONSE)
+        except (OSError, ValueError):
+            pass  # Best effort; the connection is closed either way
+        self.shutdown_request(request)
+
+    def finish_request(
+        self, request: socket.socket, client_address: Tuple[str, int]
+    ) -> bool:
+        """
+        Run the request handler on a connection.
+
+        Returns:
+            True if the handler left the connection open and idle between
+            keep-alive requests, so it should be parked rather than closed.
+        """
+        handler = self.RequestHandlerClass(request, client_address, self)
+        return getattr(handler, "idle_keep_alive", False)
 
     def _process_request_thread(
         self, request: socket.socket, client_address: Tuple[str, int]
     ) -> None:
         """Process a single request in a thread pool worker."""
+        idle = False
         try:
-            self.finish_request(request, client_address)
+            idle = self.finish_request(request, client_address)
         except (ConnectionResetError, ConnectionAbortedError, BrokenPipeError, OSError):
             # Client disconnected - normal behavior, no logging needed
             pass
         except Exception:
             self.handle_error(request, client_address)
         finally:
+            if idle:
+                self._park_connection(request, client_address)
+            else:
+                self.shutdown_request(request)
+
+    def _park_connection(
+        self, request: socket.socket, client_address: Tuple[str, int]
+    ) -> None:
+        """Hand an idle keep-alive connection to the watcher thread."""
+        with self._parking_lock:
+            if self._shutdown_flag:
+                self.shutdown_request(request)
+                return
+            self._parking.append((request, client_address))
+            if self._idle_watcher is None:
+                self._idle_watcher = threading.Thread(
+                    target=self._watch_idle_connections,
+                    name="vortex-idle-watcher",
+                    daemon=True,
+                )
+                self._idle_watcher.start()
+
+        try:
+            self._wakeup_send.send(b"\0")
+        except OSError:
+            pass  # Wakeup already pending (buffer full) or shutting down
+
+    def _watch_idle_connections(self) -> None:
+        """
+        Wait for parked connections to send their next request.
+
+        Readable connections go back on the worker queue; connections idle
+        for longer than KEEPALIVE_TIMEOUT are closed. Parking order equals
+        expiry order, so only the front of the deadline map is checked.
+        """
+        selector = self._idle_selector
+        deadlines: "OrderedDict[socket.socket, float]" = OrderedDict()
+
+        while not self._shutdown_flag:
+            # Adopt newly parked connections
+            with self._parking_lock:
+                parked, self._parking = self._parking, []
+            now = time.monotonic()
+            for request, client_address in parked:
+                try:
+                    selector.register(request, selectors.EVENT_READ, client_address)
+                except (OSError, ValueError):
+                    self.shutdown_request(request)
+                    continue
+                deadlines[request] = now + KEEPALIVE_TIMEOUT
+
+            # Close connections whose idle timeout has passed
+            while deadlines:
+                request, deadline = next(iter(deadlines.items()))
+                if deadline > now:
+                    break
+                del deadlines[request]
+                selector.unregister(request)
+                self.shutdown_request(request)
+
+            try:
+                events = selector.select(timeout=1.0)
+            except OSError:
+                events = []
+            for key, _ in events:
+                if key.fileobj is self._wakeup_recv:
+                    try:
+                        while self._wakeup_recv.recv(4096):
+                            pass
+                    except OSError:
+                        pass
+                    continue
+                request = key.fileobj
+                selector.unregister(request)
+                del deadlines[request]
+                self._dispatch_request(request, key.data)
+
+        # Server is closing: drop every connection still parked
+        with self._parking_lock:
+            parked, self._parking = self._parking, []
+        for request in list(deadlines) + [item[0] for item in parked]:
             self.shutdown_request(request)
 
     def handle_error(
@@ -474,10 +1421,36 @@ class PooledHTTPServer(HTTPServer):
         super().shutdown()
 
     def server_close(self) -> None:
-        """Clean up the thread pool when server closes."""
-        self._shutdown_flag = True
+        """Close queued and parked connections and stop the worker threads."""
+        with self._parking_lock:
+            self._shutdown_flag = True
+            watcher = self._idle_watcher
         super().server_close()
-        self.executor.shutdown(wait=False, cancel_futures=True)
+
+        if watcher is not None:
+            try:
+                self._wakeup_send.send(b"\0")
+            except OSError:
+                pass
+            watcher.join(timeout=2.0)
+        self._idle_selector.close()
+        self._wakeup_recv.close()
+        self._wakeup_send.close()
+
+        # Drop connections that never reached a worker
+        while True:
+            try:
+                item = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                self.shutdown_request(item[0])
+
+        for _ in self._workers:
+            try:
+                self._pending.put_nowait(None)
+            except queue.Full:
+                break
 
 
 # HTTP Request Handler
@@ -500,14 +1473,27 @@ class VortexHandler(SimpleHTTPRequestHandler):
     Attributes:
         base_directory: Root directory being served (absolute path).
         protocol_version: HTTP/1.1 for persistent connections.
+        timeout: Socket timeout within a request (and for idle TLS clients).
         security_manager: Optional security manager for auth/rate limiting.
         is_https: Whether connection is using HTTPS.
+        idle_keep_alive: Set when the connection was left open and idle
+            for the server to park until the next request.
     """
 
     base_directory: str
     protocol_version = "HTTP/1.1"
+    timeout = KEEPALIVE_TIMEOUT
     security_manager: Optional["SecurityManager"] = None
     is_https: bool = False
+    idle_keep_alive: bool = False
+
+    # Request path that _parsed_url was computed for
+    _parsed_url_path: Optional[str] = None
+    _parsed_url: Tuple[str, Dict[str, str]]
+
+    # Last Cookie header seen on this connection and the device_id in it
+    _device_cookie: Optional[str] = None
+    _device_cookie_id: Optional[str] = None
 
     def __init__(
         self,
@@ -523,7 +1509,10 @@ class VortexHandler(SimpleHTTPRequestHandler):
         """
         if directory is None:
             directory = os.getcwd()
-        self.base_directory = os.path.abspath(directory)
+        elif not os.path.isabs(directory):
+            directory = os.path.abspath(directory)
+        # run_server passes an already-resolved path, so this is usually free
+        self.base_directory = directory
         super().__init__(*args, directory=directory, **kwargs)
 
     def setup(self) -> None:
@@ -538,6 +1527,59 @@ class VortexHandler(SimpleHTTPRequestHandler):
         except (OSError, AttributeError):
             pass  # Not all systems support these options
 
+        if _TCP_NOTSENT_LOWAT_OPTION is not None:
+            try:
+                # Keep large bodies from piling up unsent in the kernel,
+                # bounding per-connection memory with many downloads running
+                self.connection.setsockopt(
+                    socket.IPPROTO_TCP, _TCP_NOTSENT_LOWAT_OPTION, TCP_NOTSENT_LOWAT
+                )
+            except OSError:
+                pass
+
+    def handle(self) -> None:
+        """
+        Handle requests until the connection closes or goes idle.
+
+        Rather than blocking this worker thread until a keep-alive client
+        sends its next request, an idle plain HTTP connection is returned
+        to the server to park (see PooledHTTPServer).
+        """
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            if self._is_idle():
+                self.idle_keep_alive = True
+                return
+            self.handle_one_request()
+
+    def _is_idle(self) -> bool:
+        """
+        Check whether the connection can be parked until its next request.
+
+        Only plain sockets qualify: TLS keeps its own record buffer, so an
+        idle TLS connection stays on its worker as before. A pipelined
+        request that already arrived is served straight away, since it
+        could be sitting in rfile's buffer where the selector can't see it.
+
+        Returns:
+            True if no request data is waiting to be read.
+        """
+        if not hasattr(self.server, "_park_connection") or isinstance(
+            self.connection, ssl.SSLSocket
+        ):
+            return False
+        try:
+            # Non-blocking peek: returns buffered or already-received bytes
+            self.connection.setblocking(False)
+            try:
+                waiting = self.rfile.peek(1)
+            finally:
+                self.connection.settimeout(self.timeout)
+        except OSError:
+            return False
+        return not waiting
+
     def log_message(self, format: str, *args: Any) -> None:
         """Suppress default logging for cleaner output."""
         pass
@@ -548,14 +1590,10 @@ class VortexHandler(SimpleHTTPRequestHandler):
         """Send security headers to prevent common attacks."""
         if self.security_manager:
             # Use comprehensive security headers from security manager
-            for header, value in self.security_manager.get_security_headers(
-                self.is_https
-            ).items():
-                self.send_header(header, value)
+            self._send_header_block(self.security_manager.get_security_header_block())
         else:
             # Fallback: basic security headers
-            self.send_header("X-Content-Type-Options", "nosniff")
-            self.send_header("X-Frame-Options", "DENY")
+            self._send_header_block(_BASIC_SECURITY_HEADERS)
 
     def _is_host(self) -> bool:
         """
@@ -600,13 +1638,14 @@ class VortexHandler(SimpleHTTPRequestHandler):
         device_name = self.headers.get("X-Device-Name", "Unknown")
         
         if not device_id:
-            # Try to get from cookie
+            # Try to get from cookie (parsed once per distinct Cookie header
+            # on this connection, since keep-alive clients repeat it verbatim)
             cookie_header = self.headers.get("Cookie", "")
-            for cookie in cookie_header.split(";"):
-                cookie = cookie.strip()
-                if cookie.startswith("device_id="):
-                    device_id = cookie.split("=", 1)[1]
-                    break
+            if cookie_header != self._device_cookie:
+                match = _DEVICE_ID_COOKIE_RE.search(cookie_header)
+                self._device_cookie = cookie_header
+                self._device_cookie_id = match.group(1).rstrip() if match else None
+            device_id = self._device_cookie_id
 
         # Check if device is banned
         if device_id and device_id in _banned_devices:
@@ -616,9 +1655,8 @@ class VortexHandler(SimpleHTTPRequestHandler):
         # Register active device if we have device info
         if device_id:
             # Extract session_id from path
-            parsed = urlparse(self.path)
-            query_params = parse_qs(parsed.query)
-            session_id = query_params.get("session", [""])[0]
+            _, query_params = self._parse_url()
+            session_id = query_params.get("session", "")
             
             # If no session in query, try to get from request data for POST
             if not session_id and self.command == "POST":
@@ -629,6 +1667,33 @@ class VortexHandler(SimpleHTTPRequestHandler):
 
         return True
 
+    def _parse_url(self) -> Tuple[str, Dict[str, str]]:
+        """
+        Split the request target into path and query, once per request.
+
+        The security checks and the request handlers all need the URL;
+        the result is kept until the next request line arrives. Origin-form
+        targets ("/path?query") are split with str.partition(); only the
+        rare absolute-form target goes through urlsplit().
+
+        Returns:
+            Tuple of (URL path, still percent-encoded; query parameters).
+        """
+        if self._parsed_url_path != self.path:
+            target = self.path
+            if target.startswith("/"):
+                url_path, _, query = target.partition("?")
+                url_path = url_path.partition("#")[0]
+                query = query.partition("#")[0]
+            else:
+                split = urlsplit(target)
+                url_path, query = split.path, split.query
+            # Most file requests have no query string
+            query_params = _parse_query(query) if query else {}
+            self._parsed_url = (url_path, query_params)
+            self._parsed_url_path = target
+        return self._parsed_url
+
     def _validate_security(self) -> bool:
         """
         Validate request against security manager.
@@ -640,13 +1705,12 @@ class VortexHandler(SimpleHTTPRequestHandler):
             return True
 
         # Get token from query string or header
-        parsed = urlparse(self.path)
-        query_params = parse_qs(parsed.query)
+        _, query_params = self._parse_url()
         token = None
 
         # Check query string first
         if "token" in query_params:
-            token = query_params["token"][0]
+            token = query_params["token"]
         # Then check Authorization header
         elif auth_header := self.headers.get("Authorization"):
             if auth_header.startswith("Bearer "):
@@ -676,7 +1740,7 @@ class VortexHandler(SimpleHTTPRequestHandler):
         Returns:
             True if the path is safe, False otherwise.
         """
-        return is_path_safe(Path(path), Path(self.base_directory))
+        return _is_within_base(path, self.base_directory)
 
     # Response Helpers
 
@@ -684,34 +1748,145 @@ class VortexHandler(SimpleHTTPRequestHandler):
         """Send an HTML response with proper headers."""
         encoded = content.encode(ENCODING, "surrogateescape")
         self.send_response(status)
-        self.send_header("Content-Type", CONTENT_TYPE_HTML)
-        self.send_header("Content-Length", str(len(encoded)))
+        self._send_headers(
+            ("Content-Type", CONTENT_TYPE_HTML),
+            ("Content-Length", str(len(encoded))),
+        )
         self._send_security_headers()
-        self.end_headers()
-        self.wfile.write(encoded)
+        self._end_headers_with_body(encoded)
 
     def _send_json(self, data: Dict[str, Any], status: int = 200) -> None:
         """Send a JSON response with proper headers."""
-        json_str = json.dumps(data, ensure_ascii=False)
-        encoded = json_str.encode(ENCODING)
+        self._send_json_bytes(_json_dumps(data), status)
+
+    def _send_json_error(self, message: str, status: int) -> None:
+        """Send a {"error": message} JSON response, encoded once per message."""
+        encoded = _error_bodies.get(message)
+        if encoded is None:
+            encoded = _error_bodies[message] = _json_dumps({"error": message})
+        self._send_json_bytes(encoded, status)
+
+    def _send_json_bytes(self, encoded: bytes, status: int) -> None:
+        """Send an already encoded JSON body with proper headers."""
         self.send_response(status)
-        self.send_header("Content-Type", "application/json; charset=utf-8")
-        self.send_header("Content-Length", str(len(encoded)))
+        self._send_headers(
+            ("Content-Type", "application/json; charset=utf-8"),
+            ("Content-Length", str(len(encoded))),
+        )
         self._send_security_headers()
-        self.end_headers()
-        self.wfile.write(encoded)
+        self._end_headers_with_body(encoded)
+
+    def send_response(self, code: int, message: Optional[str] = None) -> None:
+        """
+        Log the response and add its status line, Server and Date headers.
+
+        Produces the same bytes as the base class, but the status line and
+        Server header come pre-encoded per status code and the Date header
+        is formatted at most once a second.
+
+        Args:
+            code: HTTP status code.
+            message: Reason phrase; defaults to the standard one.
+        """
+        if message is not None or self.request_version == "HTTP/0.9":
+            super().send_response(code, message)
+            return
+
+        self.log_request(code)
+        key = (self.protocol_version, code)
+        status = _status_blocks.get(key)
+        if status is None:
+            reason = self.responses[code][0] if code in self.responses else ""
+            status = _status_blocks[key] = (
+                f"{self.protocol_version} {code} {reason}\r\n"
+                f"Server: {self.version_string()}\r\n"
+            ).encode("latin-1", "strict")
+        self._send_header_block(status + _get_date_header())
+
+    def _send_headers(self, *headers: Tuple[str, str]) -> None:
+        """
+        Add several headers to the response as one encoded block.
+
+        Equivalent to calling send_header() for each pair, but formats and
+        encodes them together and appends a single buffer entry.
+
+        Args:
+            *headers: (name, value) pairs, in the order to send them.
+        """
+        self._send_header_block(
+            "".join([f"{name}: {value}\r\n" for name, value in headers]).encode(
+                "latin-1", "strict"
+            )
+        )
+
+    def _send_header_block(self, block: bytes) -> None:
+        """
+        Append pre-encoded header lines to the response headers.
+
+        Args:
+            block: One or more complete "Name: value\\r\\n" lines.
+        """
+        if self.request_version != "HTTP/0.9":
+            if not hasattr(self, "_headers_buffer"):
+                self._headers_buffer = []
+            self._headers_buffer.append(block)
+
+    def _end_headers_with_body(self, body: Union[bytes, memoryview]) -> None:
+        """
+        Finish the header block and send it together with the body.
+
+        Headers and body go out in a single scatter/gather sendmsg() call,
+        so small responses cost one syscall and usually one TCP segment.
+        Falls back to a single joined write on TLS or where sendmsg() is
+        unavailable.
+
+        Args:
+            body: The complete response body.
+        """
+        head = b""
+        if hasattr(self, "_headers_buffer"):
+            self._headers_buffer.append(b"\r\n")
+            head = b"".join(self._headers_buffer)
+            self._headers_buffer = []
+
+        if not _HAS_SENDMSG or isinstance(self.connection, ssl.SSLSocket):
+            self.wfile.write(head + body)
+            return
+
+        _sendmsg_all(self.connection, [head, body])
 
     def _parse_json_body(self) -> Optional[Dict[str, Any]]:
-        """Parse JSON from request body."""
+        """
+        Parse a JSON object from the request body.
+
+        The body is parsed straight from bytes (orjson when installed),
+        without decoding it to str first. On failure a 400 response is
+        sent before returning.
+
+        Returns:
+            The parsed object, or None if the body was missing, larger
+            than MAX_JSON_BODY_SIZE, or not a JSON object.
+        """
         try:
-            length = int(self.headers.get("Content-Length", "0"))
-            if length == 0:
-                return None
-            body = self.rfile.read(length).decode(ENCODING)
-            return json.loads(body)
-        except (ValueError, json.JSONDecodeError):
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length <= 0 or length > MAX_JSON_BODY_SIZE:
+            # Any body left unread would be taken for the next request
+            self.close_connection = True
+            self._send_json_error("Invalid request size", 400)
             return None
 
+        body = self.rfile.read(length)
+        try:
+            data = orjson.loads(body) if orjson is not None else json.loads(body)
+        except ValueError:  # Includes both libraries' JSONDecodeError
+            data = None
+        if not isinstance(data, dict):
+            self._send_json_error("Invalid JSON", 400)
+            return None
+        return data
+
     def _send_error_safe(self, code: int, message: str) -> None:
         """Send error response, catching any connection errors."""
         try:
@@ -721,70 +1896,164 @@ class VortexHandler(SimpleHTTPRequestHandler):
 
     # ZIP Download Handler
 
-    def _handle_zip_download(self, dir_path: str, include_body: bool = True) -> None:
+    def _handle_zip_download(
+        self, dir_path: str, include_body: bool = True, compress: bool = True
+    ) -> None:
         """
         Handle a request to download directory contents as a ZIP file.
 
-        Creates an in-memory ZIP archive of all files in the directory
-        (not recursive) and streams it to the client.
+        Zips all files in the directory (not recursive) and streams the
+        archive to the client as it is produced, using chunked transfer
+        encoding. Already-compressed media is stored rather than deflated,
+        and the rest uses fast deflate (ZIP_COMPRESS_LEVEL).
+        Memory use stays at about one chunk regardless of archive size, and
+        the first bytes go out immediately.
 
         Args:
             dir_path: Path to the directory to zip.
             include_body: Whether to include body (False for HEAD requests).
+            compress: Whether to deflate compressible files (?compress=0
+                stores everything, trading size for speed).
         """
         directory = Path(dir_path)
         dir_name = directory.name or "download"
         zip_filename = f"{dir_name}.zip"
 
-        # Build ZIP in memory to determine size for Content-Length
-        zip_buffer = io.BytesIO()
-
+        # Collect files up front so an empty directory can still get a 404
+        files: List[Path] = []
         try:
-            with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-                for entry in directory.iterdir():
-                    try:
-                        if entry.is_file():
-                            zf.write(entry, entry.name)
-                    except (OSError, PermissionError):
-                        continue
-        except Exception as e:
+            for entry in directory.iterdir():
+                try:
+                    if entry.is_file():
+                        files.append(entry)
+                except (OSError, PermissionError):
+                    continue
+        except OSError as e:
             self._send_error_safe(500, f"Failed to create ZIP: {e}")
             return
 
-        zip_size = zip_buffer.tell()
-        zip_buffer.seek(0)
-
-        if zip_size == 0:
+        if not files:
             self._send_error_safe(404, "No files to download")
             return
 
-        # Send response
-        self.send_response(200)
-        self.send_header("Content-Type", CONTENT_TYPE_ZIP)
-        self.send_header("Content-Length", str(zip_size))
-        self.send_header(
-            "Content-Disposition", f'attachment; filename="{zip_filename}"'
-        )
-        self.send_header("Cache-Control", "no-cache")
-        self._send_security_headers()
-        self.end_headers()
+        # HTTP/1.0 has no chunked encoding: end the body by closing instead
+        chunked = self.request_version == "HTTP/1.1"
+        if not chunked:
+            self.close_connection = True
+
+        with self._tcp_cork(include_body):
+            # Send response (size is unknown until the archive is finished)
+            self.send_response(200)
+            headers = [
+                ("Content-Type", CONTENT_TYPE_ZIP),
+                (
+                    "Content-Disposition",
+                    _content_disposition("attachment", zip_filename),
+                ),
+                ("Cache-Control", "no-cache"),
+            ]
+            if chunked:
+                headers.insert(1, ("Transfer-Encoding", "chunked"))
+            self._send_headers(*headers)
+            self._send_security_headers()
+            self.end_headers()
 
-        # Stream ZIP content
-        if include_body:
+            if not include_body:
+                return
+
+            # Stream ZIP content
+            writer_class = _ChunkedWriter if chunked else _RawWriter
+            writer = writer_class(self.wfile, self.connection)
             try:
-                while True:
-                    chunk = zip_buffer.read(CHUNK_SIZE)
-                    if not chunk:
-                        break
-                    self.wfile.write(chunk)
-            except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
-                pass
+                with zipfile.ZipFile(
+                    writer,
+                    "w",
+                    zipfile.ZIP_DEFLATED,
+                    allowZip64=True,
+                    compresslevel=ZIP_COMPRESS_LEVEL,
+                ) as zf:
+                    for entry in files:
+                        # Store already-compressed media as-is; deflate the rest
+                        compress_type = (
+                            zipfile.ZIP_DEFLATED
+                            if compress and not is_precompressed(entry.name)
+                            else zipfile.ZIP_STORED
+                        )
+                        # Only errors from the source file skip an entry; send
+                        # errors from the writer propagate and end the response
+                        try:
+                            src = open(entry, "rb")
+                        except OSError:
+                            continue  # File vanished or became unreadable
+                        with src:
+                            try:
+                                zinfo = zipfile.ZipInfo.from_file(entry, entry.name)
+                            except OSError:
+                                continue
+                            zinfo.compress_type = compress_type
+                            # ZipFile's compresslevel only reaches entries it
+                            # creates itself, so set it on ours as write() does
+                            if hasattr(zinfo, "compress_level"):
+                                zinfo.compress_level = ZIP_COMPRESS_LEVEL  # 3.13+
+                            else:
+                                zinfo._compresslevel = ZIP_COMPRESS_LEVEL
+                            with zf.open(zinfo, "w") as dest:
+                                while True:
+                                    try:
+                                        data = src.read(CHUNK_SIZE)
+                                    except OSError:
+                                        break  # Keep what was read; the entry stays valid
+                                    if not data:
+                                        break
+                                    dest.write(data)
+                writer.finish()
+            except (OSError, ValueError, RuntimeError):
+                # Headers are already sent, so the only way to signal
+                # failure is to drop the connection mid-body. RuntimeError
+                # comes from a file growing past its ZIP64-free size.
+                self.close_connection = True
 
     # File Streaming
 
+    @contextmanager
+    def _tcp_cork(self, enabled: bool = True) -> Iterator[None]:
+        """
+        Hold back partial TCP segments for the duration of the block.
+
+        Uses TCP_CORK on Linux and TCP_NOPUSH on BSD/macOS so response
+        headers and body are coalesced into full-sized segments. Pending
+        data is pushed out when the cork is removed on exit.
+
+        Args:
+            enabled: Whether to cork at all (False when the response goes
+                out in a single send, or has no body).
+        """
+        corked = False
+        if enabled and _TCP_CORK_OPTION is not None:
+            try:
+                self.connection.setsockopt(socket.IPPROTO_TCP, _TCP_CORK_OPTION, 1)
+                corked = True
+            except OSError:
+                pass  # Not supported on this socket
+
+        try:
+            yield
+        finally:
+            if corked:
+                try:
+                    self.connection.setsockopt(socket.IPPROTO_TCP, _TCP_CORK_OPTION, 0)
+                except OSError:
+                    pass  # Connection already gone
+
     def _stream_file(self, file_path: str, start: int, end: int) -> bool:
         """
-        Stream a file range to the client in chunks.
+        Stream a file range to the client.
+
+        On plain HTTP connections the range is sent with os.sendfile(), so
+        the kernel copies straight from the page cache to the socket. TLS
+        connections, and platforms where sendfile is unavailable, use a
+        chunked read/write loop instead, reading with os.preadv() at
+        explicit offsets where available.
 
         Args:
             file_path: Path to the file to stream.
@@ -794,20 +2063,62 @@ class VortexHandler(SimpleHTTPRequestHandler):
         Returns:
             True if streaming completed successfully, False otherwise.
         """
-        bytes_to_send = end - start + 1
+        offset = start
+        remaining = end - start + 1
 
         try:
-            with open(file_path, "rb") as f:
-                f.seek(start)
-                remaining = bytes_to_send
+            with open(file_path, "rb", buffering=0) as f:
+                in_fd = f.fileno()
+                if _HAS_FADVISE:
+                    self._advise_sequential(in_fd, start, remaining)
 
+                if _HAS_SENDFILE and not isinstance(self.connection, ssl.SSLSocket):
+                    # Make sure buffered headers go out before the file data
+                    self.wfile.flush()
+                    out_fd = self.connection.fileno()
+                    write_waiter: Optional[selectors.BaseSelector] = None
+                    try:
+                        while remaining > 0:
+                            try:
+                                sent = os.sendfile(out_fd, in_fd, offset, remaining)
+                            except BlockingIOError:
+                                # Send buffer full (socket has a timeout): wait on a
+                                # selector for room. DefaultSelector (epoll/kqueue/poll)
+                                # handles fds >= 1024, unlike select.select().
+                                if write_waiter is None:
+                                    write_waiter = selectors.DefaultSelector()
+                                    write_waiter.register(out_fd, selectors.EVENT_WRITE)
+                                if not write_waiter.select(self.timeout):
+                                    raise TimeoutError("send timed out")
+                                continue
+                            if sent == 0:
+                                break  # File shrank underneath us
+                            offset += sent
+                            remaining -= sent
+                        return True
+                    except OSError as e:
+                        # Unsupported for this file/socket: copy in userspace
+                        if e.errno not in (errno.EINVAL, errno.ENOSYS) or offset != start:
+                            raise
+                    finally:
+                        if write_waiter is not None:
+                            write_waiter.close()
+
+                if not _HAS_PREADV:
+                    f.seek(offset)
+                view = memoryview(get_scratch_buffer(CHUNK_SIZE))
                 while remaining > 0:
-                    chunk_size = min(CHUNK_SIZE, remaining)
-                    chunk = f.read(chunk_size)
-                    if not chunk:
+                    chunk = view[:min(CHUNK_SIZE, remaining)]
+                    if _HAS_PREADV:
+                        # One syscall per chunk: no lseek, no shared file offset
+                        read_len = os.preadv(in_fd, [chunk], offset)
+                    else:
+                        read_len = f.readinto(chunk)
+                    if not read_len:
                         break
-                    self.wfile.write(chunk)
-                    remaining -= len(chunk)
+                    self.wfile.write(view[:read_len])
+                    offset += read_len
+                    remaining -= read_len
 
             return True
         except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
@@ -815,15 +2126,38 @@ class VortexHandler(SimpleHTTPRequestHandler):
         except OSError:
             return False
 
+    @staticmethod
+    def _advise_sequential(fd: int, start: int, length: int) -> None:
+        """
+        Tell the kernel a file range is about to be read front to back.
+
+        SEQUENTIAL widens the readahead window for the whole range, and
+        WILLNEED starts fetching the first READAHEAD_HINT_SIZE bytes while
+        the headers are still going out. The prefetch is capped so a
+        multi-gigabyte download does not flood the page cache up front.
+
+        Args:
+            fd: Descriptor of the open file.
+            start: First byte of the range.
+            length: Length of the range in bytes.
+        """
+        try:
+            os.posix_fadvise(fd, start, length, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(
+                fd, start, min(length, READAHEAD_HINT_SIZE), os.POSIX_FADV_WILLNEED
+            )
+        except OSError:
+            pass  # Advisory only
+
     # API Endpoints
 
-    def _handle_api_messages_get(self, query_params: Dict[str, List[str]]) -> None:
+    def _handle_api_messages_get(self, query_params: Dict[str, str]) -> None:
         """Handle GET /api/messages - retrieve chat messages."""
-        session_id = query_params.get("session", [""])[0]
-        since_id = query_params.get("since", [""])[0] or None
+        session_id = query_params.get("session", "")
+        since_id = query_params.get("since", "") or None
 
         if not session_id:
-            self._send_json({"error": "Missing session parameter"}, 400)
+            self._send_json_error("Missing session parameter", 400)
             return
 
         messages = _get_messages(session_id, since_id)
@@ -832,13 +2166,21 @@ class VortexHandler(SimpleHTTPRequestHandler):
             "session_id": session_id
         })
 
-    def _handle_api_events_sse(self, query_params: Dict[str, List[str]]) -> None:
+    def _handle_api_events_sse(self, query_params: Dict[str, str]) -> None:
         """
         Handle GET /api/events - Server-Sent Events endpoint for real-time messages.
         
         Keeps connection open and streams new messages as they arrive.
+        Clients reconnecting pass the last message they saw (``since`` query
+        parameter or ``Last-Event-ID`` header) and only receive newer ones.
+        The directory size is pushed once per connection as a ``size`` event.
         """
-        session_id = query_params.get("session", [""])[0]
+        session_id = query_params.get("session", "")
+        since_id = (
+            query_params.get("since", "")
+            or self.headers.get("Last-Event-ID")
+            or None
+        )
         
         if not session_id:
             self._send_error_safe(400, "Missing session parameter")
@@ -861,13 +2203,18 @@ class VortexHandler(SimpleHTTPRequestHandler):
             self.wfile.write(b": heartbeat\n\n")
             self.wfile.flush()
             
-            # Send existing messages as initial data
-            existing_messages = _get_messages(session_id)
+            # Send messages the client has not seen yet as initial data
+            existing_messages = _get_messages(session_id, since_id)
             if existing_messages:
                 for msg in existing_messages:
-                    event_data = f"data: {json.dumps(msg)}\n\n"
-                    self.wfile.write(event_data.encode(ENCODING))
+                    self.wfile.write(_format_sse_event(msg))
                 self.wfile.flush()
+
+            # Send directory size as a named event on the same connection,
+            # saving clients a separate /api/directory-size request
+            size_info = _calculate_directory_size(self.base_directory)
+            self.wfile.write(b"event: size\ndata: %s\n\n" % _json_dumps(size_info))
+            self.wfile.flush()
             
             # Keep connection alive and send new messages
             while True:
@@ -876,8 +2223,7 @@ class VortexHandler(SimpleHTTPRequestHandler):
                     message = client_queue.get(timeout=30)
                     
                     # Send message as SSE event
-                    event_data = f"data: {json.dumps(message)}\n\n"
-                    self.wfile.write(event_data.encode(ENCODING))
+                    self.wfile.write(_format_sse_event(message))
                     self.wfile.flush()
                     
                 except queue.Empty:
@@ -889,8 +2235,9 @@ class VortexHandler(SimpleHTTPRequestHandler):
             # Client disconnected
             pass
         finally:
-            # Clean up
+            # Clean up; the event stream has no length, so it ends the connection
             _unregister_sse_client(session_id, client_queue)
+            self.close_connection = True
 
     def _handle_api_messages_post(self) -> None:
         """Handle POST /api/messages - send a chat message."""
@@ -898,13 +2245,11 @@ class VortexHandler(SimpleHTTPRequestHandler):
         if _chat_rate_limiter:
             client_ip = self.client_address[0]
             if not _chat_rate_limiter.check(client_ip):
-                self._send_json({"error": "Too many messages. Please slow down."}, 429)
+                self._send_json_error("Too many messages. Please slow down.", 429)
                 return
         
         data = self._parse_json_body()
-
-        if not data:
-            self._send_json({"error": "Invalid JSON"}, 400)
+        if data is None:
             return
 
         session_id = data.get("session_id")
@@ -913,7 +2258,7 @@ class VortexHandler(SimpleHTTPRequestHandler):
         device_id = data.get("device_id")
 
         if not session_id or not sender or not content:
-            self._send_json({"error": "Missing required fields"}, 400)
+            self._send_json_error("Missing required fields", 400)
             return
 
         # Register active device
@@ -922,12 +2267,12 @@ class VortexHandler(SimpleHTTPRequestHandler):
 
         # Check if device is banned
         if device_id and device_id in _banned_devices:
-            self._send_json({"error": "Device banned"}, 403)
+            self._send_json_error("Device banned", 403)
             return
 
         # Validate content length
         if len(content) > 1000:
-            self._send_json({"error": "Message too long (max 1000 chars)"}, 400)
+            self._send_json_error("Message too long (max 1000 chars)", 400)
             return
 
         # Note: _add_message now applies html.escape() to all fields
@@ -937,12 +2282,12 @@ class VortexHandler(SimpleHTTPRequestHandler):
             "status": "ok"
         })
 
-    def _handle_api_directory_size(self, query_params: Dict[str, List[str]]) -> None:
+    def _handle_api_directory_size(self, query_params: Dict[str, str]) -> None:
         """Handle GET /api/directory-size - get directory size info."""
-        session_id = query_params.get("session", [""])[0]
+        session_id = query_params.get("session", "")
 
         if not session_id:
-            self._send_json({"error": "Missing session parameter"}, 400)
+            self._send_json_error("Missing session parameter", 400)
             return
 
         size_info = _calculate_directory_size(self.base_directory)
@@ -951,7 +2296,7 @@ class VortexHandler(SimpleHTTPRequestHandler):
             "cached_at": time.time()
         })
 
-    def _handle_api_host_status(self) -> None:
+    def _handle_api_host_status(self, query_params: Dict[str, str]) -> None:
         """Handle GET /api/host-status - check if current device is the host."""
         is_host = self._is_host()
         self._send_json({"is_host": is_host})
@@ -960,30 +2305,23 @@ class VortexHandler(SimpleHTTPRequestHandler):
         """Handle POST /api/kick - ban a device (host only)."""
         # Verify host privileges
         if not self._is_host():
-            self._send_json({"error": "Unauthorized: Host access required"}, 403)
+            self._send_json_error("Unauthorized: Host access required", 403)
             return
 
-        try:
-            content_length = int(self.headers.get("Content-Length", 0))
-            if content_length <= 0 or content_length > 10000:
-                self._send_json({"error": "Invalid request size"}, 400)
-                return
-
-            body = self.rfile.read(content_length).decode("utf-8")
-            data = json.loads(body)
-        except (ValueError, json.JSONDecodeError):
-            self._send_json({"error": "Invalid JSON"}, 400)
+        data = self._parse_json_body()
+        if data is None:
             return
 
         device_id = data.get("device_id")
 
         if not device_id:
-            self._send_json({"error": "Missing device_id"}, 400)
+            self._send_json_error("Missing device_id", 400)
             return
 
         # Add to banned set and persist
-        _banned_devices.add(device_id)
-        _save_banned_devices()
+        with _banned_devices_lock:
+            _banned_devices.add(device_id)
+            _save_banned_devices()
 
         self._send_json({
             "status": "ok",
@@ -994,60 +2332,56 @@ class VortexHandler(SimpleHTTPRequestHandler):
         """Handle POST /api/unkick - unban a device (host only)."""
         # Verify host privileges
         if not self._is_host():
-            self._send_json({"error": "Unauthorized: Host access required"}, 403)
+            self._send_json_error("Unauthorized: Host access required", 403)
             return
 
-        try:
-            content_length = int(self.headers.get("Content-Length", 0))
-            if content_length <= 0 or content_length > 10000:
-                self._send_json({"error": "Invalid request size"}, 400)
-                return
-
-            body = self.rfile.read(content_length).decode("utf-8")
-            data = json.loads(body)
-        except (ValueError, json.JSONDecodeError):
-            self._send_json({"error": "Invalid JSON"}, 400)
+        data = self._parse_json_body()
+        if data is None:
             return
 
         device_id = data.get("device_id")
 
         if not device_id:
-            self._send_json({"error": "Missing device_id"}, 400)
+            self._send_json_error("Missing device_id", 400)
             return
 
         # Remove from banned set and persist
-        _banned_devices.discard(device_id)
-        _save_banned_devices()
+        with _banned_devices_lock:
+            _banned_devices.discard(device_id)
+            _save_banned_devices()
 
         self._send_json({
             "status": "ok",
             "message": "Device unbanned successfully"
         })
 
-    def _handle_api_banned_devices_get(self) -> None:
+    def _handle_api_banned_devices_get(self, query_params: Dict[str, str]) -> None:
         """Handle GET /api/banned-devices - list all banned devices (host only)."""
         # Verify host privileges
         if not self._is_host():
-            self._send_json({"error": "Unauthorized: Host access required"}, 403)
+            self._send_json_error("Unauthorized: Host access required", 403)
             return
 
         # Return list of banned device IDs
+        with _banned_devices_lock:
+            banned = list(_banned_devices)
+
         self._send_json({
-            "banned_devices": list(_banned_devices),
-            "count": len(_banned_devices)
+            "banned_devices": banned,
+            "count": len(banned)
         })
 
-    def _handle_api_active_devices_get(self, query_params: Dict[str, List[str]]) -> None:
+    def _handle_api_active_devices_get(self, query_params: Dict[str, str]) -> None:
         """Handle GET /api/active-devices - list all active devices (host only)."""
         # Verify host privileges
         if not self._is_host():
-            self._send_json({"error": "Unauthorized: Host access required"}, 403)
+            self._send_json_error("Unauthorized: Host access required", 403)
             return
 
-        session_id = query_params.get("session", [""])[0]
+        session_id = query_params.get("session", "")
 
         if not session_id:
-            self._send_json({"error": "Missing session parameter"}, 400)
+            self._send_json_error("Missing session parameter", 400)
             return
 
         active_devices = _get_active_devices(session_id)
@@ -1056,6 +2390,25 @@ class VortexHandler(SimpleHTTPRequestHandler):
             "count": len(active_devices)
         })
 
+    # API Routing
+    # One dict lookup per request instead of a chain of path comparisons.
+    # GET handlers take the query parameters; POST handlers read the body.
+
+    _GET_API_ROUTES: Dict[str, Callable[["VortexHandler", Dict[str, str]], None]] = {
+        "/api/messages": _handle_api_messages_get,
+        "/api/events": _handle_api_events_sse,
+        "/api/directory-size": _handle_api_directory_size,
+        "/api/host-status": _handle_api_host_status,
+        "/api/banned-devices": _handle_api_banned_devices_get,
+        "/api/active-devices": _handle_api_active_devices_get,
+    }
+
+    _POST_API_ROUTES: Dict[str, Callable[["VortexHandler"], None]] = {
+        "/api/messages": _handle_api_messages_post,
+        "/api/kick": _handle_api_kick_post,
+        "/api/unkick": _handle_api_unkick_post,
+    }
+
     # HTTP Method Handlers
 
     def do_HEAD(self) -> None:
@@ -1081,121 +2434,167 @@ class VortexHandler(SimpleHTTPRequestHandler):
         if not self._check_device_ban():
             return
 
-        # Parse URL for query parameters
-        parsed = urlparse(self.path)
-        query_params = parse_qs(parsed.query)
-        clean_path = unquote(parsed.path)
+        # Parse URL for query parameters (already done by the checks above)
+        url_path, query_params = self._parse_url()
 
-        # API Endpoints
-        if clean_path == "/api/messages":
-            self._handle_api_messages_get(query_params)
-            return
-        elif clean_path == "/api/events":
-            self._handle_api_events_sse(query_params)
-            return
-        elif clean_path == "/api/directory-size":
-            self._handle_api_directory_size(query_params)
-            return
-        elif clean_path == "/api/host-status":
-            self._handle_api_host_status()
-            return
-        elif clean_path == "/api/banned-devices":
-            self._handle_api_banned_devices_get()
-            return
-        elif clean_path == "/api/active-devices":
-            self._handle_api_active_devices_get(query_params)
+        # API Endpoints (routes are plain ASCII, so only decode escaped paths)
+        api_path = unquote(url_path) if "%" in url_path else url_path
+        api_handler = self._GET_API_ROUTES.get(api_path)
+        if api_handler is not None:
+            api_handler(self, query_params)
             return
 
-        path = self.translate_path(parsed.path)
+        path = self.translate_path(url_path)
 
         # Security: Validate path is within base directory
         if not self._is_request_path_safe(path):
             self._send_error_safe(403, "Access denied")
             return
 
+        # One stat serves the directory check, the file check and the headers
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            self._send_error_safe(404, "File not found")
+            return
+
         # Directory Handling
-        if os.path.isdir(path):
+        if stat.S_ISDIR(file_stat.st_mode):
             # ZIP download request
-            if query_params.get("download") == ["zip"]:
-                self._handle_zip_download(path, include_body)
+            if query_params.get("download") == "zip":
+                compress = query_params.get("compress") != "0"
+                self._handle_zip_download(path, include_body, compress)
                 return
 
-            # Regular directory listing
+            if not include_body:
+                # HEAD: skip scanning and rendering; the length and ETag
+                # are only known once the page is built, so omit them
+                self.send_response(200)
+                self._send_headers(
+                    ("Content-Type", CONTENT_TYPE_HTML),
+                    ("Cache-Control", "no-cache"),
+                )
+                self._send_security_headers()
+                self.end_headers()
+                return
+
+            # Regular directory listing (cached per directory version)
             try:
-                session_id = _get_session_id(self.base_directory)
-                html_page = render_directory_listing(
-                    self.base_directory, path, parsed.path, session_id
+                etag, page = _get_directory_listing(
+                    self.base_directory, path, url_path, file_stat
                 )
-                self._send_html(html_page)
             except (OSError, PermissionError) as e:
                 self._send_error_safe(403, f"Cannot access directory: {e}")
+                return
+
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE_HTML)
+            self.send_header("Content-Length", str(len(page)))
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self._send_security_headers()
+            self._end_headers_with_body(page)
             return
 
-        # File Not Found
-        if not os.path.isfile(path):
+        # File Not Found (sockets, FIFOs and devices are not served either)
+        if not stat.S_ISREG(file_stat.st_mode):
             self._send_error_safe(404, "File not found")
             return
 
         # File Handling
-        try:
-            file_stat = os.stat(path)
-            file_size = file_stat.st_size
-        except OSError as e:
-            self._send_error_safe(403, f"Cannot access file: {e}")
-            return
+        file_size = file_stat.st_size
+
+        headers = self.headers
+
+        # Check If-None-Match for caching (304 Not Modified) before any
+        # response headers are built; the 304 only carries the ETag
+        if_none_match = headers.get("If-None-Match")
+        if if_none_match:
+            etag = _get_file_etag(path, file_stat)
+            if if_none_match == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
 
-        # Generate response headers
-        mime_type = get_mime_type(path)
-        etag = generate_etag(path, file_stat)
-        last_modified = formatdate(file_stat.st_mtime, usegmt=True)
-        filename = os.path.basename(path)
-
-        # Check If-None-Match for caching (304 Not Modified)
-        if_none_match = self.headers.get("If-None-Match")
-        if if_none_match and if_none_match == etag:
-            self.send_response(304)
-            self.end_headers()
-            return
+        # Generate response headers (cached per file version)
+        etag, static_headers = _get_file_metadata(path, file_stat)
 
         # Range Request Handling
-        range_header = self.headers.get("Range")
-
+        range_header = headers.get("Range")
+
+        # If-Range: only honor the range if the client's copy is still current,
+        # otherwise a resumed or parallel download would splice two versions
+        if_range = headers.get("If-Range") if range_header else None
+        if if_range and if_range != etag:
+            # Not our ETag; if it isn't an ETag at all it is a Last-Modified date
+            last_modified = formatdate(file_stat.st_mtime, usegmt=True)
+            if if_range.startswith(('"', "W/")) or if_range != last_modified:
+                range_header = None
+
+        byte_range = None
         if range_header:
             byte_range = parse_range_header(range_header, file_size)
 
-            if byte_range is None:
-                # Invalid range - send 416 Range Not Satisfiable
-                self.send_response(416)
-                self.send_header("Content-Range", f"bytes */{file_size}")
-                self.end_headers()
-                return
+        if byte_range == RANGE_NOT_SATISFIABLE:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{file_size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
 
+        if byte_range is not None:
             start, end = byte_range
-            content_length = end - start + 1
-
-            # Send 206 Partial Content
-            self.send_response(206)
-            self.send_header("Content-Range", f"bytes {start}-{end}/{file_size}")
+            status = 206
         else:
             # Full file request
             start, end = 0, file_size - 1
-            content_length = file_size
-            self.send_response(200)
+            status = 200
+
+        content_length = end - start + 1
+
+        # Small files are served from memory, headers and body in one send
+        content = None
+        streaming = include_body and content_length > 0
+        if streaming:
+            content = _get_small_file(path, file_stat)
+            if content is not None:
+                streaming = False
+                if status == 206:
+                    # Slice without copying the cached bytes
+                    content = memoryview(content)[start:end + 1]
+
+        # Cork the socket so headers and the first body bytes share packets
+        # (single-send responses need no cork)
+        with self._tcp_cork(streaming):
+            self.send_response(status)
+
+            # Send Headers (the per-file ones come pre-encoded from the cache)
+            if status == 206:
+                self._send_headers(
+                    ("Content-Range", f"bytes {start}-{end}/{file_size}"),
+                    ("Content-Length", str(content_length)),
+                )
+            else:
+                self._send_header_block(b"Content-Length: %d\r\n" % content_length)
+            self._send_header_block(static_headers)
+            self._send_security_headers()
 
-        # Send Headers
-        self.send_header("Content-Type", mime_type)
-        self.send_header("Content-Length", str(content_length))
-        self.send_header("Accept-Ranges", "bytes")
-        self.send_header("ETag", etag)
-        self.send_header("Last-Modified", last_modified)
-        self.send_header("Cache-Control", "public, max-age=3600")
-        self.send_header("Content-Disposition", f'inline; filename="{filename}"')
-        self._send_security_headers()
-        self.end_headers()
+            if content is not None:
+                self._end_headers_with_body(content)
+                return
 
-        # Stream file content (skip for HEAD requests)
-        if include_body and content_length > 0:
-            self._stream_file(path, start, end)
+            self.end_headers()
+
+            # Stream file content (skip for HEAD requests)
+            if streaming:
+                self._stream_file(path, start, end)
 
     def do_POST(self) -> None:
         """
@@ -1213,18 +2612,13 @@ class VortexHandler(SimpleHTTPRequestHandler):
             return
 
         # Parse URL path
-        parsed = urlparse(self.path)
-        clean_path = unquote(parsed.path)
+        url_path, _ = self._parse_url()
 
-        # API Endpoints
-        if clean_path == "/api/messages":
-            self._handle_api_messages_post()
-            return
-        elif clean_path == "/api/kick":
-            self._handle_api_kick_post()
-            return
-        elif clean_path == "/api/unkick":
-            self._handle_api_unkick_post()
+        # API Endpoints (routes are plain ASCII, so only decode escaped paths)
+        api_path = unquote(url_path) if "%" in url_path else url_path
+        api_handler = self._POST_API_ROUTES.get(api_path)
+        if api_handler is not None:
+            api_handler(self)
             return
 
         content_type = self.headers.get("Content-Type", "")
@@ -1262,13 +2656,19 @@ class VortexHandler(SimpleHTTPRequestHandler):
             return
 
         if not result.success:
+            # Unknown amount of the body is still unread; don't reuse the connection
+            self.close_connection = True
             self._send_error_safe(400, result.error_message or "Upload failed")
             return
 
+        if not result.keep_alive:
+            self.close_connection = True
+
         # Redirect back to root after successful upload
         try:
             self.send_response(303)
             self.send_header("Location", "/")
+            self.send_header("Content-Length", "0")
             self.end_headers()
         except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
             pass
@@ -1276,11 +2676,17 @@ class VortexHandler(SimpleHTTPRequestHandler):
 
 # Network Utilities
 
+# get_local_ip() results keyed by mode
+_local_ips: Dict[str, Tuple[str, str]] = {}
+
 
 def get_local_ip(mode: str = "auto") -> Tuple[str, str]:
     """
     Detect the appropriate server address based on mode.
 
+    The result is remembered per mode for the life of the process, so only
+    the first call probes the network.
+
     Args:
         mode: Address detection mode.
             - 'auto': Intelligent detection (try LAN, fallback to localhost)
@@ -1292,19 +2698,35 @@ def get_local_ip(mode: str = "auto") -> Tuple[str, str]:
         bind_address is always '0.0.0.0' for accepting connections.
         display_address is the user-facing IP for sharing.
     """
+    addresses = _local_ips.get(mode)
+    if addresses is None:
+        addresses = _local_ips[mode] = _detect_local_ip(mode)
+    return addresses
+
+
+def _detect_local_ip(mode: str) -> Tuple[str, str]:
+    """
+    Probe the network for the server address; see get_local_ip().
+
+    Args:
+        mode: Address detection mode.
+
+    Returns:
+        Tuple of (bind_address, display_address).
+    """
     bind_address = "0.0.0.0"
 
     if mode == "localhost":
         return bind_address, "localhost"
 
     # Try UDP socket trick with multiple DNS servers
+    # (connect() on a UDP socket only picks a route; nothing is sent)
     for dns_server in DNS_SERVERS:
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.settimeout(1.0)
-            sock.connect(dns_server)
-            ip = sock.getsockname()[0]
-            sock.close()
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                sock.settimeout(1.0)
+                sock.connect(dns_server)
+                ip = sock.getsockname()[0]
             # Skip IPv6 addresses (contain ':')
             if ":" not in ip and not ip.startswith("127."):
                 return bind_address, ip
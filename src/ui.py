@@ -12,8 +12,7 @@ web UI for browsing and uploading files.
 
 import html
 import os
-from pathlib import Path
-from typing import List
+from typing import List, Tuple
 from urllib.parse import unquote
 
 from .scripts import JS_UPLOAD_HANDLER
@@ -84,7 +83,6 @@ def render_layout(title: str, body_html: str) -> str:
 <meta name="format-detection" content="telephone=no">
 <meta name="theme-color" content="#e8e4e0">
 <title>{escaped_title}</title>
-<script src="https://cdn.jsdelivr.net/npm/qrcodejs@1.0.0/qrcode.min.js"></script>
 <style>{_COMPLETE_STYLESHEET}</style>
 </head>
 <body>
@@ -110,33 +108,37 @@ def render_layout(title: str, body_html: str) -> str:
 # Directory Listing
 
 
-def _build_file_table_rows(real_path: Path, base_directory: str) -> List[str]:
+def _build_file_table_rows(fs_path: str, base_directory: str) -> Tuple[List[str], int]:
     """
     Build HTML table rows for directory entries.
 
     Creates a table row for each file and subdirectory, including
-    a parent directory link ("..") when not at the root.
+    a parent directory link ("..") when not at the root. The directory
+    is read once with os.scandir(), whose entries already know their
+    type, so only files are stat'ed (for their size).
 
     Args:
-        real_path: Path to the directory being listed.
+        fs_path: Path to the directory being listed.
         base_directory: Root directory being served.
 
     Returns:
-        List of HTML table row strings.
+        Tuple of (HTML table row strings, number of regular files).
     """
     rows: List[str] = []
+    file_count = 0
 
     # Add parent directory link if not at root
-    rel = os.path.relpath(real_path, base_directory)
+    rel = os.path.relpath(fs_path, base_directory)
     if rel != ".":
         rows.append('<tr><td><a href="../">[..]</a></td><td></td></tr>')
 
     # Sort entries case-insensitively
     try:
-        entries = sorted(real_path.iterdir(), key=lambda p: p.name.lower())
+        with os.scandir(fs_path) as it:
+            entries = sorted(it, key=lambda e: e.name.lower())
     except (OSError, PermissionError):
         # Cannot read directory - return what we have
-        return rows
+        return rows, file_count
 
     for entry in entries:
         try:
@@ -147,6 +149,8 @@ def _build_file_table_rows(real_path: Path, base_directory: str) -> List[str]:
             if is_dir:
                 size = "-"
             else:
+                if entry.is_file():
+                    file_count += 1
                 try:
                     size = format_size(entry.stat().st_size)
                 except (OSError, PermissionError):
@@ -160,7 +164,7 @@ def _build_file_table_rows(real_path: Path, base_directory: str) -> List[str]:
             # Skip entries we cannot access
             continue
 
-    return rows
+    return rows, file_count
 
 
 def render_directory_listing(
@@ -184,24 +188,11 @@ def render_directory_listing(
     Returns:
         Complete HTML page for the directory listing.
     """
-    real_path = Path(fs_path)
     display_path = html.escape(unquote(request_path))
     base_name = html.escape(os.path.basename(base_directory) or "/")
 
-    # Build file table rows
-    rows = _build_file_table_rows(real_path, base_directory)
-
-    # Count files (not directories) for Download All button
-    file_count = 0
-    try:
-        for entry in real_path.iterdir():
-            try:
-                if entry.is_file():
-                    file_count += 1
-            except (OSError, PermissionError):
-                continue
-    except (OSError, PermissionError):
-        pass
+    # Build file table rows, counting files for the Download All button
+    rows, file_count = _build_file_table_rows(fs_path, base_directory)
 
     # Build the file table HTML
     table_html = (
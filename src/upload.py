@@ -18,8 +18,8 @@ from dataclasses import dataclass
 from io import BufferedIOBase
 from typing import Optional, Union
 
-from .constants import CHUNK_SIZE, ENCODING, MAX_HEADER_SIZE
-from .utils import sanitize_filename
+from .constants import CHUNK_SIZE, ENCODING, MAX_DRAIN_SIZE, MAX_HEADER_SIZE
+from .utils import get_scratch_buffer, sanitize_filename
 
 
 # Upload Result
@@ -33,14 +33,117 @@ class UploadResult:
     Attributes:
         success: True if the upload completed successfully.
         error_message: Description of the error if success is False.
+        keep_alive: False if unread body remains, so the connection can't
+            be reused for another request.
     """
 
     success: bool
     error_message: Optional[str] = None
+    keep_alive: bool = True
+
+
+# Page Cache Management
+# Uploads are written once and rarely read back right away; keeping them
+# out of the page cache preserves it for files being served.
+
+_HAS_FADVISE = hasattr(os, "posix_fadvise")
+PAGE_CACHE_RELEASE_INTERVAL = 8 * CHUNK_SIZE  # Bytes written between releases
+
+
+class _CacheReleasingWriter:
+    """
+    File writer that drops written pages from the page cache as it goes.
+
+    Every PAGE_CACHE_RELEASE_INTERVAL bytes the file is flushed and
+    POSIX_FADV_DONTNEED is issued for the data written so far. The kernel
+    starts writeback for dirty pages and drops clean ones, so each range
+    is advised twice: once to start writeback, and again one interval
+    later when the pages are clean and can actually be dropped. Does
+    nothing beyond plain writes where posix_fadvise() is unavailable.
+    """
+
+    def __init__(self, file: BufferedIOBase) -> None:
+        self._file = file
+        self._written = 0
+        self._advised = 0  # End of the range advised at the last release
+        self._released = 0  # End of the range advised twice
+
+    def write(self, data: Union[bytes, memoryview]) -> None:
+        """Write data, releasing cached pages every interval."""
+        self._file.write(data)
+        self._written += len(data)
+        pending = self._written - self._advised
+        if _HAS_FADVISE and pending >= PAGE_CACHE_RELEASE_INTERVAL:
+            self._release(self._released, self._written)
+            self._released = self._advised
+            self._advised = self._written
+
+    def finish(self) -> None:
+        """Flush and start releasing every page of the file."""
+        if _HAS_FADVISE and self._written:
+            self._release(0, self._written)
+
+    def _release(self, start: int, end: int) -> None:
+        """Advise the kernel that bytes [start, end) are no longer needed."""
+        self._file.flush()
+        try:
+            os.posix_fadvise(
+                self._file.fileno(), start, end - start, os.POSIX_FADV_DONTNEED
+            )
+        except OSError:
+            pass  # Advisory only
 
 
 # Multipart Parsing
 
+# Precompiled patterns for header parsing
+_BOUNDARY_RE = re.compile(r"boundary=([^;]+)")
+_FILENAME_RE = re.compile(rb'filename="([^"]+)"')
+
+
+def _strip_crlf(data: Union[bytes, bytearray], end: int) -> int:
+    """
+    Drop a CRLF that ends data[:end], without copying.
+
+    Args:
+        data: Buffer holding the part body.
+        end: Exclusive end offset of the body within data.
+
+    Returns:
+        The end offset with a trailing CRLF excluded.
+    """
+    if end >= 2 and data[end - 2] == 0x0D and data[end - 1] == 0x0A:
+        return end - 2
+    return end
+
+
+def _drain(
+    rfile: Union[BufferedIOBase, "SocketIO"],  # type: ignore[name-defined]
+    remaining: int,
+) -> bool:
+    """
+    Read and discard the unread part of a request body.
+
+    Bodies with more than MAX_DRAIN_SIZE bytes left are not read at all;
+    the caller should close the connection instead.
+
+    Args:
+        rfile: The request input stream.
+        remaining: Number of body bytes not yet read.
+
+    Returns:
+        True if the whole body has been consumed, False otherwise.
+    """
+    if remaining > MAX_DRAIN_SIZE:
+        return False
+    view = memoryview(get_scratch_buffer(CHUNK_SIZE))
+    while remaining > 0:
+        read_len = rfile.readinto(view[:min(CHUNK_SIZE, remaining)])
+        if not read_len:
+            return False
+        remaining -= read_len
+    return True
+
 
 def extract_boundary(content_type: str) -> Optional[str]:
     """
@@ -55,7 +158,7 @@ def extract_boundary(content_type: str) -> Optional[str]:
     Returns:
         The boundary string, or None if not found.
     """
-    match = re.search(r"boundary=(.+)", content_type)
+    match = _BOUNDARY_RE.search(content_type)
     if not match:
         return None
 
@@ -142,18 +245,18 @@ def parse_multipart_streaming(
         return UploadResult(success=False, error_message="Malformed multipart data")
 
     headers_block, file_data_start = header_buffer.split(b"\r\n\r\n", 1)
-    headers_text = headers_block.decode(ENCODING, "replace")
 
     # Verify this is the file field we expect
-    if 'name="file"' not in headers_text:
+    if b'name="file"' not in headers_block:
         return UploadResult(success=False, error_message="No file field found")
 
     # Extract filename from Content-Disposition header
-    filename_match = re.search(r'filename="([^"]+)"', headers_text)
+    filename_match = _FILENAME_RE.search(headers_block)
     if not filename_match:
         return UploadResult(success=False, error_message="No filename in upload")
 
-    filename = os.path.basename(filename_match.group(1))
+    filename = filename_match.group(1).decode(ENCODING, "replace")
+    filename = os.path.basename(filename)
     filename = sanitize_filename(filename)
     if not filename:
         return UploadResult(success=False, error_message="Empty filename")
@@ -186,63 +289,73 @@ def parse_multipart_streaming(
     try:
         temp_fd, temp_path = tempfile.mkstemp(dir=base_directory, prefix=".upload_")
 
-        with os.fdopen(temp_fd, "wb") as temp_file:
+        with os.fdopen(temp_fd, "wb") as raw_file:
             temp_fd = None  # fdopen takes ownership of the file descriptor
+            temp_file = _CacheReleasingWriter(raw_file)
 
             # Check if the entire file was in the initial buffer
+            # Slices of the memoryview are written without copying
+            start_view = memoryview(file_data_start)
             boundary_pos = file_data_start.find(boundary_bytes)
             if boundary_pos != -1:
                 # Small file: everything fit in the header buffer
-                file_data = file_data_start[:boundary_pos]
-                if file_data.endswith(b"\r\n"):
-                    file_data = file_data[:-2]
-                temp_file.write(file_data)
+                end = _strip_crlf(file_data_start, boundary_pos)
+                temp_file.write(start_view[:end])
             else:
                 # Large file: need to stream the rest
-                # Use optimized buffer for boundary detection
+                # Reads go into the thread's reusable buffer; only the short
+                # tail that could hold a split boundary is carried between reads.
                 boundary_len = len(boundary_bytes)
-                
+                overlap = boundary_len + 2
+
                 # Write initial safe data
-                if len(file_data_start) > boundary_len + 2:
-                    safe_len = len(file_data_start) - boundary_len - 2
-                    temp_file.write(file_data_start[:safe_len])
-                    buffer = file_data_start[safe_len:]
-                else:
-                    buffer = file_data_start
+                safe_len = max(0, len(file_data_start) - overlap)
+                if safe_len:
+                    temp_file.write(start_view[:safe_len])
+
+                buffer = get_scratch_buffer(CHUNK_SIZE + overlap)
+                view = memoryview(buffer)
+                filled = len(file_data_start) - safe_len
+                buffer[:filled] = start_view[safe_len:]
 
                 # Stream remaining data with optimized chunked reads
                 while remaining > 0:
                     to_read = min(CHUNK_SIZE, remaining)
-                    chunk = rfile.read(to_read)
-                    if not chunk:
+                    read_len = rfile.readinto(view[filled:filled + to_read])
+                    if not read_len:
                         break
-                    remaining -= len(chunk)
-                    
-                    # Append to buffer and check for boundary
-                    buffer += chunk
-                    boundary_pos = buffer.find(boundary_bytes)
-                    
+                    remaining -= read_len
+
+                    # Only rescan the carried tail where a boundary may start
+                    search_from = max(0, filled - boundary_len + 1)
+                    filled += read_len
+                    boundary_pos = buffer.find(boundary_bytes, search_from, filled)
+
                     if boundary_pos != -1:
                         # Found boundary - write final data
-                        data_to_write = buffer[:boundary_pos]
-                        if data_to_write.endswith(b"\r\n"):
-                            data_to_write = data_to_write[:-2]
-                        temp_file.write(data_to_write)
+                        end = _strip_crlf(buffer, boundary_pos)
+                        temp_file.write(view[:end])
                         break
-                    
+
                     # Write all but potential boundary overlap
-                    if len(buffer) > boundary_len + 2:
-                        safe_len = len(buffer) - boundary_len - 2
-                        temp_file.write(buffer[:safe_len])
-                        buffer = buffer[safe_len:]
+                    if filled > overlap:
+                        safe_len = filled - overlap
+                        temp_file.write(view[:safe_len])
+                        buffer[:overlap] = buffer[safe_len:filled]
+                        filled = overlap
                 else:
                     # No boundary found - write remaining buffer
-                    if buffer:
-                        if buffer.endswith(b"\r\n"):
-                            buffer = buffer[:-2]
-                        if buffer.endswith(b"--"):
-                            buffer = buffer[:-2]
-                        temp_file.write(buffer)
+                    end = _strip_crlf(buffer, filled)
+                    if buffer.endswith(b"--", 0, end):
+                        end -= 2
+                    if end > 0:
+                        temp_file.write(view[:end])
+
+            temp_file.finish()
+
+        # Consume the rest of the body (closing boundary, trailing fields)
+        # so the connection is positioned at the next request
+        drained = _drain(rfile, remaining)
 
         # Phase 4: Move temp file to final destination
         # Atomic rename to final destination.
@@ -250,7 +363,7 @@ def parse_multipart_streaming(
         os.rename(temp_path, dest_path)
         temp_path = None  # Successfully moved
 
-        return UploadResult(success=True)
+        return UploadResult(success=True, keep_alive=drained)
 
     except OSError as e:
         return UploadResult(success=False, error_message=f"Failed to save file: {e}")
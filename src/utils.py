@@ -11,16 +11,24 @@ MIME type detection, HTTP header parsing, and other common operations.
 
 import os
 import re
+import threading
 from hashlib import md5
 from pathlib import Path
 from typing import Optional, Tuple
 
-from .constants import CONTENT_TYPE_OCTET, MIME_TYPES
+from .constants import (
+    CONTENT_TYPE_OCTET,
+    MIME_TYPES,
+    PRECOMPRESSED_MIME_TYPES,
+    STRICT_ETAGS,
+    UNCOMPRESSED_MEDIA_TYPES,
+)
 
 # Filename Sanitization
 
 # Characters that are invalid in Windows filenames: \ / : * ? " < > |
-INVALID_FILENAME_CHARS = re.compile(r'[\\/:*?"<>|]')
+# Precomputed translation table mapping each of them to an underscore
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys('\\/:*?"<>|', "_"))
 
 
 def sanitize_filename(filename: str) -> str:
@@ -38,7 +46,7 @@ def sanitize_filename(filename: str) -> str:
         Returns "uploaded_file" if the result would be empty.
     """
     # Replace invalid characters with underscore
-    sanitized = INVALID_FILENAME_CHARS.sub("_", filename)
+    sanitized = filename.translate(_SANITIZE_TABLE)
 
     # Remove leading/trailing spaces and dots (problematic on Windows)
     sanitized = sanitized.strip(" .")
@@ -82,6 +90,9 @@ def is_path_safe(path: Path, base_directory: Path) -> bool:
 
 # MIME Type Detection
 
+# MIME_TYPES keyed by bare extension (no leading dot) for rpartition lookups
+_MIME_TYPES_NODOT = {ext[1:]: mime for ext, mime in MIME_TYPES.items()}
+
 
 def get_mime_type(file_path: str) -> str:
     """
@@ -96,30 +107,65 @@ def get_mime_type(file_path: str) -> str:
     Returns:
         MIME type string (e.g., "video/mp4", "image/png").
     """
-    ext = os.path.splitext(file_path)[1].lower()
-    return MIME_TYPES.get(ext, CONTENT_TYPE_OCTET)
+    _, dot, ext = file_path.rpartition(".")
+    if not dot or "/" in ext or "\\" in ext:
+        # No extension, or the last dot belongs to a directory name
+        return CONTENT_TYPE_OCTET
+    return _MIME_TYPES_NODOT.get(ext.lower(), CONTENT_TYPE_OCTET)
+
+
+def is_precompressed(file_path: str) -> bool:
+    """
+    Check whether a file's format is already compressed.
+
+    Covers most video, audio and image formats plus archives. Compressing
+    such files again (e.g. in a ZIP) costs CPU but saves almost nothing.
+
+    Args:
+        file_path: Path to the file (only extension is used).
+
+    Returns:
+        True if the file is likely already compressed.
+    """
+    mime_type = get_mime_type(file_path)
+    if mime_type in PRECOMPRESSED_MIME_TYPES:
+        return True
+    if mime_type in UNCOMPRESSED_MEDIA_TYPES:
+        return False
+    return mime_type.startswith(("video/", "audio/", "image/"))
 
 
 # HTTP Header Utilities
 
+# Single byte range; anything else (including multi-range) does not match
+_RANGE_RE = re.compile(
+    r"\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*", re.ASCII | re.IGNORECASE
+)
+
+# Returned by parse_range_header for ranges that lie outside the file
+RANGE_NOT_SATISFIABLE: Tuple[int, int] = (-1, -1)
+
 
 def generate_etag(file_path: str, file_stat: os.stat_result) -> str:
     """
     Generate an ETag for HTTP caching validation.
 
-    The ETag is computed from the file path, size, and modification time.
-    This allows browsers to efficiently check if their cached version
-    is still valid without downloading the entire file.
+    The ETag is the file size and nanosecond modification time in hex
+    (the classic size-mtime scheme used by Apache and others), which is
+    cheap to compute and changes whenever the file does. Set STRICT_ETAGS
+    to hash the path, size and mtime with MD5 instead.
 
     Args:
         file_path: Path to the file.
         file_stat: Result of os.stat() on the file.
 
     Returns:
-        ETag string in quotes (e.g., '"abc123def456"').
+        ETag string in quotes (e.g., '"1a2b-17c3d4e5f6a7b8c9"').
     """
-    etag_data = f"{file_path}:{file_stat.st_size}:{file_stat.st_mtime}"
-    return f'"{md5(etag_data.encode()).hexdigest()}"'
+    if STRICT_ETAGS:
+        etag_data = f"{file_path}:{file_stat.st_size}:{file_stat.st_mtime}"
+        return f'"{md5(etag_data.encode()).hexdigest()}"'
+    return f'"{file_stat.st_size:x}-{file_stat.st_mtime_ns:x}"'
 
 
 def parse_range_header(range_header: str, file_size: int) -> Optional[Tuple[int, int]]:
@@ -134,55 +180,90 @@ def parse_range_header(range_header: str, file_size: int) -> Optional[Tuple[int,
         - "bytes=500-"    : From byte 500 to end of file
         - "bytes=-500"    : Last 500 bytes of file
 
+    Malformed and multi-range headers are ignored, as RFC 9110 allows, so
+    the client receives the full file. Well-formed ranges that fall outside
+    the file yield RANGE_NOT_SATISFIABLE, which should be answered with 416.
+
     Args:
         range_header: The Range header value (e.g., "bytes=0-1023").
         file_size: Total size of the file in bytes.
 
     Returns:
-        Tuple of (start, end) byte positions (inclusive), or None if
-        the range is invalid or unsupported (e.g., multi-range).
+        Tuple of (start, end) byte positions (inclusive), None if the
+        header should be ignored, or RANGE_NOT_SATISFIABLE.
     """
-    # Range header must start with "bytes="
-    if not range_header.startswith("bytes="):
-        return None
-
-    range_spec = range_header[6:].strip()
-
-    # Multi-range requests are not supported
-    if "," in range_spec:
-        return None
+    # Fast path for the exact "bytes=N-M" form browsers send; anything
+    # else (whitespace, odd case, multiple ranges, numbers longer than any
+    # real offset) goes through the regex and the guarded conversion below
+    first, sep, last = range_header[6:].partition("-")
+    if not (
+        sep
+        and range_header.startswith("bytes=")
+        and range_header.isascii()
+        and len(first) <= 19
+        and len(last) <= 19
+        and (first.isdigit() or not first)
+        and (last.isdigit() or not last)
+    ):
+        match = _RANGE_RE.fullmatch(range_header)
+        if not match:
+            return None
+        first, last = match.groups()
 
     try:
-        if range_spec.startswith("-"):
+        if not first:
             # Suffix range: "-500" means last 500 bytes
-            suffix_length = int(range_spec[1:])
-            if suffix_length <= 0:
+            if not last:
                 return None
-            start = max(0, file_size - suffix_length)
-            end = file_size - 1
+            suffix_length = int(last)
+            if suffix_length == 0 or file_size == 0:
+                return RANGE_NOT_SATISFIABLE
+            return (max(0, file_size - suffix_length), file_size - 1)
 
-        elif range_spec.endswith("-"):
+        start = int(first)
+        if last:
+            # Explicit range: "0-1023"
+            end = int(last)
+            if end < start:
+                return None
+        else:
             # Open-ended range: "500-" means from byte 500 to end
-            start = int(range_spec[:-1])
             end = file_size - 1
+    except ValueError:
+        # Number too long for int() (Python's max-str-digits limit)
+        return None
 
-        else:
-            # Explicit range: "0-1023"
-            parts = range_spec.split("-")
-            if len(parts) != 2:
-                return None
-            start = int(parts[0])
-            end = int(parts[1])
+    if start >= file_size:
+        return RANGE_NOT_SATISFIABLE
 
-        # Validate range bounds
-        if start < 0 or end < start or start >= file_size:
-            return None
+    # Clamp end to file size (handle oversized range requests gracefully)
+    return (start, min(end, file_size - 1))
 
-        # Clamp end to file size (handle oversized range requests gracefully)
-        end = min(end, file_size - 1)
 
-        return (start, end)
+# Scratch Buffers
+# One reusable I/O buffer per thread. Pool threads live for the life of the
+# server, so streaming and upload loops stop allocating a chunk per request.
 
-    except ValueError:
-        # Invalid integer in range specification
-        return None
+_scratch = threading.local()
+
+
+def get_scratch_buffer(size: int) -> bytearray:
+    """
+    Get the calling thread's reusable scratch buffer.
+
+    The buffer is shared by everything running on the thread, so it must
+    not be held across calls that might use it too. It is never resized
+    in place (callers may keep memoryviews of it); a larger request
+    replaces it with a new buffer instead.
+
+    Args:
+        size: Minimum buffer size in bytes.
+
+    Returns:
+        A bytearray of at least size bytes with undefined contents.
+    """
+    buffer = getattr(_scratch, "buffer", None)
+    if buffer is None or len(buffer) < size:
+        buffer = bytearray(size)
+        _scratch.buffer = buffer
+    return buffer